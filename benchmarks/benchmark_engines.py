@@ -0,0 +1,76 @@
+# Compares the rows per second of the 'python' and 'numpy' engines of DummyDataframe for
+# every column type.
+#
+# Usage:
+#     python -m benchmarks.benchmark_engines --rows 1000 100000
+#     python -m benchmarks.benchmark_engines --rows 20000 2000000 --min-speedup 1
+
+"""
+Engine benchmark
+"""
+
+import argparse
+import sys
+import time
+from dummydf import DummyDataframe
+
+# Generator method used for each column type.
+METHODS = {
+    'STRING': 'generate_list_with_random_strings',
+    'BYTE': 'generate_list_with_random_bytes',
+    'HEX': 'generate_list_with_random_hexadecimal_digits',
+    'ACCOUNT': 'generate_list_with_random_accounts',
+    'DATETIME': 'generate_list_with_random_datetimes',
+    'FLOAT': 'generate_list_with_random_floats',
+    'INTEGER': 'generate_list_with_random_integers',
+}
+
+
+def rows_per_second(engine: str, method: str, rows: int, repeat: int = 5) -> float:
+    """
+    Time the best of repeat calls of the given generator method.
+
+    Args:
+        engine (str): engine of the DummyDataframe.
+        method (str): name of the generator method.
+        rows (int): number of rows to generate.
+        repeat (int): number of calls.
+
+    Returns: float
+
+    """
+    dummy = DummyDataframe(engine=engine)
+    dummy.cfg = dict(dummy.cfg, dataframe_rows=rows)
+    seconds = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        getattr(dummy, method)()
+        seconds = min(seconds, time.perf_counter() - start)
+    return rows / (seconds or float('nan'))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--repeat', type=int, default=5, help='calls timed, the best is kept')
+    parser.add_argument('--min-speedup', type=float, help='exit with status 1 if the numpy engine is slower than '
+                                                          'this times the python engine for any type')
+    args = parser.parse_args()
+
+    print('{:<10}{:>12}{:>16}{:>16}{:>10}'.format('TYPE', 'ROWS', 'PYTHON ROWS/S', 'NUMPY ROWS/S', 'SPEEDUP'))
+    slower = []
+    for rows in args.rows:
+        for column_type, method in METHODS.items():
+            python_speed = rows_per_second('python', method, rows, args.repeat)
+            numpy_speed = rows_per_second('numpy', method, rows, args.repeat)
+            print('{:<10}{:>12}{:>16,.0f}{:>16,.0f}{:>9.1f}x'.format(
+                column_type, rows, python_speed, numpy_speed, numpy_speed / python_speed))
+            if args.min_speedup is not None and numpy_speed < args.min_speedup * python_speed:
+                slower.append('{} ({} rows)'.format(column_type, rows))
+    if slower:
+        print('Below the minimum speedup: {}'.format(', '.join(slower)))
+    return 1 if slower else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
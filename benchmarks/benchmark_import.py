@@ -0,0 +1,62 @@
+# Measures the time taken by import dummydf with python -X importtime, in a fresh interpreter
+# each time, and fails if it goes over a threshold so that startup regressions are caught.
+#
+# Usage:
+#     python -m benchmarks.benchmark_import --repeat 5 --max-ms 50
+
+"""
+Import time benchmark
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str = 'dummydf') -> dict:
+    """
+    Import module in a fresh interpreter with -X importtime.
+
+    Args:
+        module (str): module to import.
+
+    Returns: dict
+        cumulative import time in microseconds of every module imported, by name.
+
+    """
+    python_path = os.pathsep.join(filter(None, [REPOSITORY, os.environ.get('PYTHONPATH')]))
+    environment = dict(os.environ, PYTHONPATH=python_path)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)],
+                            stderr=subprocess.PIPE, universal_newlines=True, env=environment, check=True)
+    times = {}
+    # Lines look like: "import time:       self [us] |  cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5, help='imports measured, the best one is kept')
+    parser.add_argument('--max-ms', type=float, help='fail if import dummydf takes longer')
+    parser.add_argument('--top', type=int, default=10, help='slowest imported modules shown')
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times['dummydf'])
+    milliseconds = best['dummydf'] / 1000
+    print('import dummydf: {:.1f} ms (best of {})'.format(milliseconds, args.repeat))
+    for name, microseconds in sorted(best.items(), key=lambda item: -item[1])[:args.top]:
+        print('{:>10.1f} ms  {}'.format(microseconds / 1000, name))
+    if args.max_ms is not None and milliseconds > args.max_ms:
+        sys.exit('import dummydf took {:.1f} ms, more than {} ms'.format(milliseconds, args.max_ms))
+
+
+if __name__ == '__main__':
+    main()
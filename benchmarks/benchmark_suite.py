@@ -0,0 +1,151 @@
+# Measures the rows per second and the peak memory of every generator method and every stage
+# of the pipeline of DummyDataframe (create_dataframe, insert_rubbish_to_df and the whole
+# constructor), for several numbers of rows. The results can be saved as JSON and compared
+# with a previous run, failing if any stage got slower or bigger than a threshold.
+#
+# Usage:
+#     python -m benchmarks.benchmark_suite --engine numpy --rows 100 1000 10000 100000 1000000 10000000 \
+#         --output after.json --compare before.json --threshold 0.2
+#
+# The time is the best of --repeat runs without tracing. The peak memory is measured by
+# tracemalloc in one more run, as tracing slows down the Python code.
+
+"""
+Benchmark suite
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable
+import numpy as np
+import pandas as pd
+from benchmarks.benchmark_engines import METHODS
+from dummydf import DummyDataframe
+
+# Whole pipeline stages, after the generator methods.
+STAGES = tuple(METHODS.values()) + ('create_dataframe', 'insert_rubbish_to_df', 'constructor')
+
+
+def prepare(stage: str, engine: str, rows: int) -> Callable[[], object]:
+    """
+    Everything needed before running a stage, e.g. the dataframe where the rubbish is inserted,
+    so that only the stage itself is measured.
+
+    Args:
+        stage (str): one of STAGES.
+        engine (str): engine of the DummyDataframe.
+        rows (int): number of rows to generate.
+
+    Returns: Callable[[], object]
+        runs the stage once.
+
+    """
+    dummy = DummyDataframe(engine=engine)
+    dummy.cfg = dict(dummy.cfg, dataframe_rows=rows)
+    if stage == 'constructor':
+        # The dataframe is built on first access of df.
+        return lambda: DummyDataframe(yaml_config=dummy.cfg, engine=engine).df
+    if stage == 'insert_rubbish_to_df':
+        df = dummy.create_dataframe()
+        return lambda: dummy.insert_rubbish_to_df(df.copy())
+    return getattr(dummy, stage)
+
+
+def measure(stage: str, engine: str, rows: int, repeat: int) -> dict:
+    """
+    Args:
+        stage (str): one of STAGES.
+        engine (str): engine of the DummyDataframe.
+        rows (int): number of rows to generate.
+        repeat (int): timed runs, the fastest one is kept.
+
+    Returns: dict
+        with the stage, engine, rows, seconds, rows_per_second and peak_bytes.
+
+    """
+    seconds = float('inf')
+    for _ in range(repeat):
+        run = prepare(stage, engine, rows)
+        start = time.perf_counter()
+        run()
+        seconds = min(seconds, time.perf_counter() - start)
+    run = prepare(stage, engine, rows)
+    tracemalloc.start()
+    try:
+        run()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'stage': stage, 'engine': engine, 'rows': rows, 'seconds': seconds,
+            'rows_per_second': rows / (seconds or float('nan')), 'peak_bytes': peak_bytes}
+
+
+def compare(results: list, baseline: list, threshold: float) -> list:
+    """
+    Regressions of results against a baseline run: stages whose rows per second dropped, or whose
+    peak memory grew, by more than threshold. Stages missing from either run are ignored.
+
+    Args:
+        results (list): measures of this run.
+        baseline (list): measures of the reference run.
+        threshold (float): tolerated relative change, e.g. 0.2 for 20 %.
+
+    Returns: list
+        of messages, empty if there is no regression.
+
+    """
+    reference = {(result['stage'], result['engine'], result['rows']): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = reference.get((result['stage'], result['engine'], result['rows']))
+        if before is None:
+            continue
+        name = '{} {} {} rows'.format(result['engine'], result['stage'], result['rows'])
+        if result['rows_per_second'] < before['rows_per_second'] * (1 - threshold):
+            regressions.append('{}: {:,.0f} rows/s, was {:,.0f}'.format(
+                name, result['rows_per_second'], before['rows_per_second']))
+        if result['peak_bytes'] > before['peak_bytes'] * (1 + threshold):
+            regressions.append('{}: peak {:,} bytes, was {:,}'.format(name, result['peak_bytes'], before['peak_bytes']))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 10000, 1000000, 10000000])
+    parser.add_argument('--engine', nargs='+', choices=DummyDataframe.ENGINES, default=['numpy'])
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs, the fastest one is kept')
+    parser.add_argument('--output', help='JSON file where the results are saved')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2, help='tolerated relative regression')
+    args = parser.parse_args()
+
+    results = []
+    print('{:<8}{:<48}{:>12}{:>16}{:>16}'.format('ENGINE', 'STAGE', 'ROWS', 'ROWS/S', 'PEAK MB'))
+    for engine in args.engine:
+        for rows in args.rows:
+            for stage in args.stages:
+                result = measure(stage, engine, rows, args.repeat)
+                results.append(result)
+                print('{:<8}{:<48}{:>12}{:>16,.0f}{:>16.1f}'.format(
+                    engine, stage, rows, result['rows_per_second'], result['peak_bytes'] / 2 ** 20))
+
+    if args.output:
+        environment = {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__}
+        with open(args.output, 'w') as output_file:
+            json.dump({'environment': environment, 'results': results}, output_file, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file)['results'], args.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            sys.exit('{} regressions beyond {:.0%}'.format(len(regressions), args.threshold))
+
+
+if __name__ == '__main__':
+    main()
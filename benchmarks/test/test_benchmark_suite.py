@@ -0,0 +1,34 @@
+import unittest
+from benchmarks import benchmark_suite
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.baseline = [
+            {'stage': 'constructor', 'engine': 'numpy', 'rows': 100, 'rows_per_second': 1000.0, 'peak_bytes': 1000},
+            {'stage': 'create_dataframe', 'engine': 'numpy', 'rows': 100, 'rows_per_second': 1000.0,
+             'peak_bytes': 1000},
+        ]
+
+    def test_changes_within_threshold_are_not_regressions(self):
+        results = [dict(result, rows_per_second=850.0, peak_bytes=1150) for result in self.baseline]
+        self.assertEqual([], benchmark_suite.compare(results, self.baseline, 0.2))
+
+    def test_slower_or_bigger_stages_are_regressions(self):
+        results = [dict(self.baseline[0], rows_per_second=700.0), dict(self.baseline[1], peak_bytes=1300)]
+        regressions = benchmark_suite.compare(results, self.baseline, 0.2)
+        self.assertEqual(2, len(regressions))
+        self.assertIn('numpy constructor 100 rows', regressions[0])
+        self.assertIn('rows/s', regressions[0])
+        self.assertIn('numpy create_dataframe 100 rows: peak', regressions[1])
+
+    def test_stages_missing_from_either_run_are_ignored(self):
+        results = [dict(self.baseline[0], rows=1000, rows_per_second=1.0)]
+        self.assertEqual([], benchmark_suite.compare(results, self.baseline[1:], 0.2))
+
+    def test_measure_reports_the_stage(self):
+        result = benchmark_suite.measure('create_dataframe', 'numpy', 100, repeat=1)
+        self.assertEqual(('create_dataframe', 'numpy', 100), (result['stage'], result['engine'], result['rows']))
+        self.assertGreater(result['rows_per_second'], 0)
+        self.assertGreater(result['peak_bytes'], 0)
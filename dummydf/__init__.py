@@ -1,6 +1,23 @@
-from dummydf.dummydf import DummyDataframe
+# Importing dummydf is cheap: DummyDataframe, and with it pandas, numpy and yaml, is only
+# imported when it is first accessed, and the example dataframes test_df and test_df_random
+# are only built when they are first accessed.
 
-test_df = DummyDataframe(randomise=False).df
-test_df_random = DummyDataframe(randomise=True).df
+__all__ = ['DummyDataframe', 'test_df', 'test_df_random']
 
-print('Welcome to dummydf')
+
+def __getattr__(name: str):
+    if name == 'DummyDataframe':
+        from dummydf.dummydf import DummyDataframe
+        value = DummyDataframe
+    elif name in ('test_df', 'test_df_random'):
+        from dummydf.dummydf import DummyDataframe
+        value = DummyDataframe(randomise=name == 'test_df_random').df
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    # Cache it, so that it is built only once.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
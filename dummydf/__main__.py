@@ -0,0 +1,68 @@
+# Command line entry point: generate a dummy dataframe straight into a file.
+#
+# python -m dummydf output.parquet --rows 100000000 --chunk-size 1000000
+# python -m dummydf output.csv --config my_config.yml --randomise
+# python -m dummydf output.parquet --rows 100000000 --memory-budget 2000000000
+# python -m dummydf shard_3.parquet --manifest manifest.json --shard 3   # see shards
+
+"""
+Dummydf command line
+"""
+
+import argparse
+import json
+from dummydf import shards
+from dummydf.dummydf import DummyDataframe
+from dummydf.writers import FORMATS
+
+
+def parse_arguments(arguments: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m dummydf', description='Write a dummy dataframe to a file.')
+    parser.add_argument('path', help='output file, its extension gives the format if --format is not given')
+    parser.add_argument('--format', choices=FORMATS, help='output format')
+    parser.add_argument('--rows', type=int, help='rows to write, by default dataframe_rows from the config')
+    parser.add_argument('--chunk-size', type=int, help='rows generated and written at a time, by default {:,} or '
+                        'the most fitting in --memory-budget'.format(DummyDataframe.CHUNK_SIZE))
+    parser.add_argument('--memory-budget', type=int, help='bytes of memory used to generate and write the chunks')
+    parser.add_argument('--config', default=DummyDataframe.YAML_FILE_DEFAULT, help='YAML config file')
+    parser.add_argument('--engine', choices=DummyDataframe.ENGINES, default='numpy', help='generation engine')
+    parser.add_argument('--workers', type=int, default=1, help='processes generating the rows')
+    parser.add_argument('--seed', type=int, help='root seed')
+    parser.add_argument('--randomise', action='store_true', help='random output instead of the rigged one')
+    parser.add_argument('--manifest', help='JSON shard manifest giving the dataset, instead of the options above')
+    parser.add_argument('--shard', type=int, help='index of the shard of --manifest to write')
+    args = parser.parse_args(arguments)
+    if (args.manifest is None) != (args.shard is None):
+        parser.error('--manifest and --shard go together')
+    if args.memory_budget is not None and args.engine != 'numpy':
+        parser.error('--memory-budget needs --engine numpy')
+    if args.rows is not None and args.engine != 'numpy':
+        parser.error('--rows needs --engine numpy, the python engine writes the dataframe_rows of the config')
+    if args.workers > 1 and args.engine != 'numpy':
+        parser.error('--workers needs --engine numpy')
+    return args
+
+
+def main(arguments: list = None) -> dict:
+    args = parse_arguments(arguments)
+    if args.manifest is not None:
+        with open(args.manifest) as manifest_file:
+            manifest = json.load(manifest_file)
+        report = shards.write_shard(manifest, args.shard, args.path, format=args.format, chunk_size=args.chunk_size,
+                                    workers=args.workers, memory_budget=args.memory_budget)
+    else:
+        dummy = DummyDataframe(
+            yaml_config=DummyDataframe.fetch_yaml_config(args.config), randomise=args.randomise, engine=args.engine,
+            workers=args.workers, seed=args.seed, memory_budget=args.memory_budget
+        )
+        report = dummy.write_to(args.path, format=args.format, rows=args.rows, chunk_size=args.chunk_size)
+    print('{rows:,} rows written to {path} in {seconds:.2f} s: {rows_per_second:,.0f} rows/s, '
+          '{megabytes:,.1f} MB ({megabytes_per_second:,.1f} MB/s)'.format(
+            megabytes=report['bytes'] / 1e6,
+            megabytes_per_second=report['bytes'] / 1e6 / (report['seconds'] or float('nan')),
+            **report))
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# Arrow backend of DummyDataframe: the columns generated by the numpy engine are turned into
+# Arrow arrays straight from their numpy buffers, without going through pandas object columns.
+#
+# Arrow columns are typed, so the rubbish is inserted as follows:
+#     - missing values (NaN, None) are nulls, set in the validity bitmap of the array.
+#     - rubbish strings ('NULL', ' ', ...) are inserted as they are in string columns, and as
+#       nulls in any other column, as they do not fit its type.
+#
+# pyarrow is only needed when this backend is used (pip install pyarrow).
+
+"""
+Arrow backend
+"""
+
+from typing import Union
+import numpy as np
+import pandas as pd
+from dummydf.writers import import_pyarrow
+
+
+def to_arrow(values: Union[list, np.ndarray], mask: np.ndarray = None):
+    """
+    Convert a column generated by the numpy engine to an Arrow array, with nulls where mask is True.
+    Numeric and fixed width bytes buffers are not copied, strings are encoded by Arrow.
+
+    Args:
+        values (Union[list, np.ndarray]): generated values.
+        mask (np.ndarray): True for the null cells. By default, no nulls.
+
+    Returns: pa.Array
+
+    """
+    pa = import_pyarrow()
+    if isinstance(values, list):
+        return pa.array(values, type=pa.binary(), mask=mask)
+    if values.dtype.kind == 'S':
+        values = np.ascontiguousarray(values)
+        # The validity bitmap of a boolean array is the bit packed mask.
+        validity = None if mask is None or not mask.any() else pa.array(~mask).buffers()[1]
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(values.dtype.itemsize), len(values), [validity, pa.py_buffer(values)])
+    if values.dtype.kind in 'UO':
+        return pa.array(values, type=pa.string(), mask=mask)
+    return pa.array(values, mask=mask)
+
+
+def to_arrow_with_rubbish(values: Union[list, np.ndarray], codes: np.ndarray, rubbish: list):
+    """
+    Convert a column to an Arrow array and insert the rubbish given by codes.
+
+    Args:
+        values (Union[list, np.ndarray]): generated values.
+        codes (np.ndarray): index in rubbish of the value of each cell, or -1 to keep it.
+        rubbish (list): rubbish values.
+
+    Returns: pa.Array
+
+    """
+    pa = import_pyarrow()
+    is_string = not isinstance(values, list) and values.dtype.kind in 'UO'
+    strings = {code: value for code, value in enumerate(rubbish) if is_string and not pd.isna(value)}
+    array = to_arrow(values, mask=(codes >= 0) & ~np.isin(codes, list(strings)))
+    for code, value in strings.items():
+        cells = codes == code
+        if cells.any():
+            array = pa.compute.replace_with_mask(
+                array, pa.array(cells), pa.array([str(value)] * int(cells.sum()), type=pa.string()))
+    return array
@@ -0,0 +1,287 @@
+# Cache of the dataframes built by DummyDataframe. When the output is deterministic, i.e. not
+# randomised or with a given seed, the same config, seed and columns always give the same
+# dataframe, so test suites that build it again and again can get it from here instead:
+#
+# cache = FrameCache(max_entries=64, directory='.dummydf_cache')
+# df = DummyDataframe(yaml_config=config, cache=cache).df
+#
+# The cache has two tiers: a bounded least recently used dictionary in memory, and optionally
+# one Feather (Arrow IPC) file per dataframe in a directory, evicted by size, which needs pyarrow.
+# Callers always get a copy, so they can modify it without changing what is cached.
+#
+# Reading the disk tier runs no code, unlike unpickling, but the cache trusts what it reads:
+# anyone who can write to the directory decides the dataframes handed to the tests, so use a
+# directory that only the test suite writes to.
+
+"""
+Frame cache
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+import numpy as np
+import pandas as pd
+from dummydf import writers
+
+# Python types of the values of object columns that the disk tier stores, in the order of their kind codes.
+OBJECT_KINDS = (type(None), str, int, float, bool, bytes, bytearray)
+
+# Arrow column holding the values of each kind of OBJECT_KINDS, None stores nothing.
+_KIND_COLUMNS = (None, 'text', 'integer', 'number', 'integer', 'data', 'data')
+
+
+def canonical(value):
+    """
+    JSON serialisable version of a config value that identifies it, order of dictionaries
+    included, since the order of the rubbish values matters.
+
+    Args:
+        value: config value, e.g. a dict with NaN keys or datetimes.
+
+    Returns:
+        lists and strings only.
+
+    """
+    if isinstance(value, dict):
+        return [[canonical(key), canonical(item)] for key, item in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    # repr tells apart 1 and 1.0 or '1', and gives the same string for every NaN.
+    return '{}:{!r}'.format(type(value).__name__, value)
+
+
+def frame_key(cfg: dict, seed: int, columns_to_display: dict, **options) -> str:
+    """
+    Stable hash of everything that determines a dataframe, independent of the process.
+
+    Args:
+        cfg (dict): config dictionary.
+        seed (int): root seed.
+        columns_to_display (dict): output column names and types.
+        **options: any other argument changing the output, e.g. engine.
+
+    Returns: str
+        hexadecimal sha256.
+
+    """
+    description = canonical([cfg, seed, columns_to_display, sorted(options.items())])
+    return hashlib.sha256(json.dumps(description).encode('utf-8')).hexdigest()
+
+
+def bytearray_columns(df: pd.DataFrame) -> list:
+    """
+    Args:
+        df (pd.DataFrame): dataframe to scan.
+
+    Returns: list
+        positions of the object columns holding bytearrays, see defensive_copy.
+
+    """
+    return [position for position, dtype in enumerate(df.dtypes)
+            if dtype == object and any(isinstance(value, bytearray) for value in df.iloc[:, position])]
+
+
+def defensive_copy(df: pd.DataFrame, mutable_columns: list = None) -> pd.DataFrame:
+    """
+    Deep copy of a dataframe, including the mutable objects (bytearray) of its object columns,
+    which df.copy(deep=True) shares with the original.
+
+    Args:
+        df (pd.DataFrame): dataframe to copy.
+        mutable_columns (list): positions of the columns holding bytearrays, the only ones whose values are
+            copied one by one. By default, see bytearray_columns.
+
+    Returns: pd.DataFrame
+
+    """
+    df = df.copy(deep=True)
+    for position in bytearray_columns(df) if mutable_columns is None else mutable_columns:
+        values = df.iloc[:, position].to_numpy().copy()
+        for row, value in enumerate(values):
+            if isinstance(value, bytearray):
+                values[row] = bytearray(value)
+        df.iloc[:, position] = pd.Series(values, index=df.index, dtype=object)
+    return df
+
+
+def frame_to_arrow(df: pd.DataFrame):
+    """
+    Arrow table from which frame_from_arrow builds the same dataframe again, mixed object columns
+    and bytearrays included. Every object column is stored as the kind of each value (its index in
+    OBJECT_KINDS) and one column per Arrow type holding the values of that type.
+
+    Args:
+        df (pd.DataFrame): dataframe with a default index, and numpy dtypes or object columns of
+            OBJECT_KINDS values.
+
+    Returns: pa.Table
+
+    """
+    pa = writers.import_pyarrow()
+    if not df.index.equals(pd.RangeIndex(len(df))):
+        raise TypeError('Only dataframes with a default index can be stored on disk')
+    types = {'text': pa.string(), 'integer': pa.int64(), 'number': pa.float64(), 'data': pa.binary()}
+    arrays = {}
+    for position, (name, column) in enumerate(df.items()):
+        if column.dtype != object:
+            if not isinstance(column.dtype, np.dtype) or column.dtype.kind not in 'biufM':
+                raise TypeError('Column {!r} of dtype {} cannot be stored on disk'.format(name, column.dtype))
+            arrays[str(position)] = pa.array(column.to_numpy())
+            continue
+        values = column.tolist()
+        try:
+            kinds = np.array([OBJECT_KINDS.index(type(value)) for value in values], dtype=np.int8)
+        except ValueError as error:
+            raise TypeError('Column {!r} holds values that cannot be stored on disk'.format(name)) from error
+        arrays['{}.kind'.format(position)] = pa.array(kinds)
+        for kind_column in sorted(set(_KIND_COLUMNS[kind] for kind in np.unique(kinds)) - {None}):
+            arrays['{}.{}'.format(position, kind_column)] = pa.array(
+                [value if _KIND_COLUMNS[kind] == kind_column else None for value, kind in zip(values, kinds)],
+                type=types[kind_column])
+    return pa.table(arrays, metadata={'columns': json.dumps(df.columns.tolist())})
+
+
+def frame_from_arrow(table) -> pd.DataFrame:
+    """
+    Args:
+        table (pa.Table): see frame_to_arrow.
+
+    Returns: pd.DataFrame
+
+    """
+    names = json.loads(table.schema.metadata[b'columns'])
+    columns = {}
+    for position in range(len(names)):
+        if str(position) in table.column_names:
+            columns[position] = table.column(str(position)).to_numpy()
+            continue
+        kinds = table.column('{}.kind'.format(position)).to_numpy()
+        values = np.full(len(kinds), None, dtype=object)
+        for kind in np.unique(kinds):
+            if OBJECT_KINDS[kind] is type(None):
+                continue
+            rows = np.flatnonzero(kinds == kind)
+            stored = table.column('{}.{}'.format(position, _KIND_COLUMNS[kind])).take(rows).to_pylist()
+            values[rows] = [OBJECT_KINDS[kind](value) for value in stored]
+        columns[position] = values
+    df = pd.DataFrame(columns, index=pd.RangeIndex(table.num_rows))
+    df.columns = names
+    return df
+
+
+class FrameCache:
+    """
+    Least recently used cache of dataframes, in memory and optionally on disk.
+
+    """
+
+    def __init__(self, max_entries: int = 32, directory: str = None, max_disk_bytes: int = 2 ** 30) -> None:
+        """
+        Args:
+            max_entries (int): dataframes kept in memory.
+            directory (str): directory of the disk tier, which needs pyarrow and must only be written by trusted
+                code. By default, no disk tier.
+            max_disk_bytes (int): size of the disk tier above which the least recently used files are deleted.
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+        self._frames = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            writers.import_pyarrow()
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def get_or_build(self, key: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        """
+        Copy of the dataframe cached under key, built and cached first if it is not in any tier.
+
+        Args:
+            key (str): see frame_key.
+            build (Callable[[], pd.DataFrame]): builds the dataframe on a miss, which is cached as it is.
+
+        Returns: pd.DataFrame
+
+        """
+        with self._lock:
+            if key in self._frames:
+                self._frames.move_to_end(key)
+                self.stats['hits'] += 1
+                df, mutable_columns = self._frames[key]
+                return defensive_copy(df, mutable_columns)
+        df = self._read_disk(key)
+        with self._lock:
+            self.stats['misses' if df is None else 'disk_hits'] += 1
+        if df is None:
+            df = build()
+            self._write_disk(key, df)
+        mutable_columns = bytearray_columns(df)
+        self._remember(key, df, mutable_columns)
+        return defensive_copy(df, mutable_columns)
+
+    def clear(self) -> None:
+        """
+        Empty both tiers. The statistics are kept.
+
+        Returns: None
+
+        """
+        with self._lock:
+            self._frames.clear()
+            for path in self._disk_files():
+                os.remove(path)
+
+    def _remember(self, key: str, df: pd.DataFrame, mutable_columns: list) -> None:
+        with self._lock:
+            # The columns holding bytearrays are found once, so that a hit only copies those one value at a time.
+            self._frames[key] = df, mutable_columns
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.feather')
+
+    def _disk_files(self) -> list:
+        if self.directory is None:
+            return []
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.feather')]
+
+    def _read_disk(self, key: str):
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+        # The modification time tells the least recently used files to evict.
+        os.utime(self._path(key))
+        pa = writers.import_pyarrow()
+        with pa.memory_map(self._path(key)) as source:
+            return frame_from_arrow(pa.ipc.open_file(source).read_all())
+
+    def _write_disk(self, key: str, df: pd.DataFrame) -> None:
+        if self.directory is None:
+            return
+        try:
+            table = frame_to_arrow(df)
+        except TypeError:
+            # Kept in memory only.
+            return
+        # Written under a temporary name first, so that other processes never read a partial file.
+        temporary_path = '{}.{}.tmp'.format(self._path(key), os.getpid())
+        writers.write_chunks([table], temporary_path, 'feather')
+        os.replace(temporary_path, self._path(key))
+        files = sorted(self._disk_files(), key=os.path.getmtime)
+        total_bytes = sum(os.path.getsize(path) for path in files)
+        while files and total_bytes > self.max_disk_bytes:
+            path = files.pop(0)
+            total_bytes -= os.path.getsize(path)
+            os.remove(path)
+            with self._lock:
+                self.stats['disk_evictions'] += 1
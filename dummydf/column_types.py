@@ -0,0 +1,177 @@
+# Registry of the column types that DummyDataframe can generate. Every type is a batched
+# generator, taking a numpy Generator and a number of rows, that declares the dtype of its
+# output and the bytes it takes per row, so that the numpy engine can generate any range of
+# rows block by block (see vectorized.generate_range) and size its chunks (see sizing).
+#
+# The built-in types are registered below. New types are registered the same way, and are then
+# available in columns_to_display with chunks, workers and both backends, e.g.:
+#
+# register_column_type('UUID', lambda rng, rows: np.frombuffer(rng.bytes(16 * rows), dtype='S16'),
+#                      dtype='S16', row_bytes=16)
+#
+# A generator must make exactly one draw from its Generator, so that the first n rows of a block
+# are the same whether n or more rows are drawn. Types used with workers must be registered when
+# the module defining them is imported, so that the worker processes know them too.
+
+"""
+Column types
+"""
+
+from typing import Callable, Union
+import numpy as np
+import pandas as pd
+from dummydf import vectorized
+
+REGISTRY = {}
+
+
+class ColumnType:
+    """
+    A column type: its batched generator and what it outputs.
+
+    """
+
+    def __init__(self, name: str, generator: Callable, dtype: Union[str, np.dtype, Callable[[dict], np.dtype]],
+                 row_bytes: Union[int, Callable[[dict], int]], parameters: Callable[[dict], dict] = None,
+                 config_keys: tuple = ()) -> None:
+        """
+        Args:
+            name (str): name used in columns_to_display.
+            generator (Callable): takes (rng, rows, **parameters) and returns rows values, as a numpy array of
+                dtype or as a list if dtype is object.
+            dtype (Union[str, np.dtype, Callable[[dict], np.dtype]]): dtype of the output, or a function of the
+                config returning it.
+            row_bytes (Union[int, Callable[[dict], int]]): memory taken by one row, or a function of the config
+                returning it.
+            parameters (Callable[[dict], dict]): keyword arguments of generator taken from the config.
+                By default, none.
+            config_keys (tuple): keys that the config must have for this type, checked by GenerationPlan.
+        """
+        self.name = name
+        self.generator = generator
+        self._dtype = dtype
+        self._row_bytes = row_bytes
+        self._parameters = parameters
+        self.config_keys = tuple(config_keys)
+
+    def dtype(self, cfg: dict) -> np.dtype:
+        """
+        Args:
+            cfg (dict): config dictionary.
+
+        Returns: np.dtype
+
+        """
+        # Scalar types such as np.float64 are callable too, but are dtypes themselves.
+        is_function = callable(self._dtype) and not isinstance(self._dtype, type)
+        return np.dtype(self._dtype(cfg) if is_function else self._dtype)
+
+    def row_bytes(self, cfg: dict) -> int:
+        """
+        Args:
+            cfg (dict): config dictionary.
+
+        Returns: int
+
+        """
+        return self._row_bytes(cfg) if callable(self._row_bytes) else self._row_bytes
+
+    def parameters(self, cfg: dict) -> dict:
+        """
+        Args:
+            cfg (dict): config dictionary.
+
+        Returns: dict
+            keyword arguments of the generator.
+
+        """
+        return {} if self._parameters is None else self._parameters(cfg)
+
+
+def register_column_type(name: str, generator: Callable, dtype: Union[str, np.dtype, Callable[[dict], np.dtype]],
+                         row_bytes: Union[int, Callable[[dict], int]], parameters: Callable[[dict], dict] = None,
+                         config_keys: tuple = (), replace: bool = False) -> ColumnType:
+    """
+    Make a column type available to DummyDataframe, see ColumnType for the arguments.
+
+    Args:
+        replace (bool): replace the type if it is already registered, instead of raising a ValueError.
+
+    Returns: ColumnType
+
+    """
+    if name in REGISTRY and not replace:
+        raise ValueError('Column type {!r} is already registered, pass replace=True to replace it'.format(name))
+    REGISTRY[name] = ColumnType(name, generator, dtype, row_bytes, parameters, config_keys)
+    return REGISTRY[name]
+
+
+def unregister_column_type(name: str) -> None:
+    """
+    Args:
+        name (str): registered column type.
+
+    Returns: None
+
+    """
+    del REGISTRY[name]
+
+
+def get_column_type(name: str) -> ColumnType:
+    """
+    Args:
+        name (str): registered column type.
+
+    Returns: ColumnType
+
+    """
+    if name not in REGISTRY:
+        raise ValueError('Unknown column type {!r}, registered types are {}'.format(name, list(REGISTRY)))
+    return REGISTRY[name]
+
+
+# Python objects take a header on top of their content, plus the pointer of the object column.
+_STR_BYTES = 8 + 49
+_BYTEARRAY_BYTES = 8 + 57
+
+
+def _datetime_parameters(cfg: dict) -> dict:
+    return {'datetime_start': np.datetime64(pd.Timestamp(cfg['datetime_start']), 's'),
+            'datetime_end': np.datetime64(pd.Timestamp(cfg['datetime_end']), 's'),
+            'datetime_format': cfg.get('datetime_format', vectorized.DATETIME_FORMAT),
+            'output': cfg.get('datetime_output', 'string')}
+
+
+def _datetime_dtype(cfg: dict) -> np.dtype:
+    parameters = _datetime_parameters(cfg)
+    if parameters['output'] == 'datetime64':
+        return np.dtype('M8[ns]')
+    width = vectorized.datetime_format_width(parameters['datetime_format'])
+    return np.dtype(object) if width is None else np.dtype('<U{}'.format(width))
+
+
+def _datetime_row_bytes(cfg: dict) -> int:
+    dtype = _datetime_dtype(cfg)
+    if dtype != object:
+        return dtype.itemsize
+    # Formats written by pandas give str objects, about as long as the format itself.
+    return _STR_BYTES + len(_datetime_parameters(cfg)['datetime_format'])
+
+
+register_column_type('STRING', vectorized.random_strings, lambda cfg: '<U{}'.format(cfg['length_strings']),
+                     lambda cfg: 4 * cfg['length_strings'], lambda cfg: {'length': cfg['length_strings']},
+                     ('length_strings',))
+register_column_type('DATETIME', vectorized.random_datetimes, _datetime_dtype, _datetime_row_bytes,
+                     _datetime_parameters, ('datetime_start', 'datetime_end'))
+register_column_type('FLOAT', vectorized.random_floats, np.float64, 8)
+register_column_type('INTEGER', vectorized.random_integers, np.int64, 8,
+                     lambda cfg: {'max_integer': cfg['max_integer']}, ('max_integer',))
+register_column_type('BYTE', vectorized.random_bytes, object, lambda cfg: _BYTEARRAY_BYTES + cfg['length_bytes'],
+                     lambda cfg: {'length': cfg['length_bytes']}, ('length_bytes',))
+# BYTE stored as one fixed width buffer, see the byte_format of DummyDataframe.
+FIXED_BYTE = ColumnType('BYTE', vectorized.random_fixed_bytes, lambda cfg: 'S{}'.format(cfg['length_bytes']),
+                        lambda cfg: cfg['length_bytes'], lambda cfg: {'length': cfg['length_bytes']}, ('length_bytes',))
+register_column_type('ACCOUNT', vectorized.random_accounts, np.int64, 8)
+register_column_type('HEX', vectorized.random_hexadecimal_digits,
+                     lambda cfg: '<U{}'.format(cfg['hex_number_length']), lambda cfg: 4 * cfg['hex_number_length'],
+                     lambda cfg: {'length': cfg['hex_number_length']}, ('hex_number_length',))
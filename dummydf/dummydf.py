@@ -12,9 +12,11 @@
 #     'BYTE': bytearray simulating importing hex values in byte format by mistake.
 #     'INTEGER': between two config values.
 #     'FLOAT': between 0 and 1.
-#     'DATETIME': in string type, as it's common to find like this in the files.
+#     'DATETIME': in string type, as it's common to find like this in the files. With the numpy
+#                 engine, drawn uniformly to the second and optionally as native datetime64.
 #     'STRING': including undesirable special characters intended to break the tests.
 #     'HEX': simulates hexadecimal values such as proforma GUIDs from SAP.
+# More types can be registered, see column_types.
 #
 # Example of class instantiation:
 # dummy = DummyDataframe(
@@ -32,19 +34,56 @@
 #
 # The resulting dataframe will have NaN, None and rubbish strings inserted to add
 # more realism to it.
+#
+# Two generation engines are available via the engine parameter:
+#     'python': the original row by row generators (default, reproduces the historic outputs).
+#     'numpy': vectorized generators that build each column as a whole array. Same column
+#              types, different values, much faster for large dataframes.
+#
+# With the numpy engine, dataframes bigger than memory can be generated in chunks:
+# for chunk in DummyDataframe(engine='numpy').iter_chunks(total_rows=10 ** 8, chunk_size=10 ** 6):
+#     ...
+# Concatenating all the chunks gives exactly the same dataframe as generating it at once.
+# The chunks can also be written straight to a CSV, Parquet or Feather file with write_to, or
+# from the command line with python -m dummydf.
+#
+# With backend='arrow', the numpy engine builds a pyarrow.Table straight from the generated
+# buffers, available in the table attribute, and chunks are Arrow tables too. The df attribute
+# is then an optional conversion of that table to pandas.
+# The rows can also be generated by a pool of processes with the workers parameter, with the
+# same output whatever the number of workers.
+#
+# Every instance owns its random number generators, seeded from the seed parameter, so
+# instances can be built concurrently (see build_many) without touching the global random
+# and np.random states.
+#
+# When the output is deterministic, the dataframes can be shared through a FrameCache, so that
+# building the same dataframe again takes a copy instead of generating it:
+# cache = FrameCache()
+# dummy = DummyDataframe(columns_to_display={'BALANCE': 'FLOAT'}, cache=cache)
+#
+# The config is checked and compiled once into a GenerationPlan, which many instances can share
+# (see plan).
 
 """
 Dummy Dataframe
 """
 
-import string
+import asyncio
 import random
 import numpy as np
 import pandas as pd
-import yaml
 from datetime import datetime
-from typing import Union
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Iterator, Union
+import copy
 import os
+import tempfile
+import time
+from dummydf import arrow_backend, column_types, sizing, state, vectorized, writers
+from dummydf.cache import FrameCache, frame_key
+from dummydf.instrumentation import Instrumentation, instrumented
+from dummydf.plan import GenerationPlan, load_yaml_config
 
 
 class DummyDataframe:
@@ -55,35 +94,231 @@ class DummyDataframe:
 
     # This is the default file that will be used if not specified otherwise.
     YAML_FILE_DEFAULT = os.path.join(os.path.dirname(__file__), 'config', 'config_dummydf.yml')
-
-    def __init__(self, yaml_config: dict = None, columns_to_display: dict = None, randomise: bool = False) -> None:
+    # Engines that can generate the columns.
+    ENGINES = ('python', 'numpy')
+    # Outputs of the numpy engine: pandas dataframes, or Arrow tables built without pandas.
+    BACKENDS = ('pandas', 'arrow')
+    # Storages of the BYTE column: one bytearray per row, or one fixed width buffer in memory or on disk.
+    BYTE_FORMATS = ('bytearray', 'fixed', 'memmap')
+    # Seed used when the output is not randomised and no seed is given.
+    DEFAULT_SEED = 10
+    # Column types generated without duplicates with unique=True: row i of a column gets the image of i
+    # by a permutation of all the possible values, keyed by the seed and the column name, so the values
+    # are distinct across chunks, workers and shards without storing any of them. The rubbish inserted
+    # (NaN, 'NULL', ...) may still repeat.
+    UNIQUE_TYPES = ('ACCOUNT', 'HEX')
+    # Rows of each chunk when neither chunk_size nor memory_budget are given.
+    CHUNK_SIZE = 100000
+    # Built-in column types, in the order of the dataframe created before selecting the columns.
+    COLUMN_TYPES = ('STRING', 'DATETIME', 'FLOAT', 'INTEGER', 'BYTE', 'ACCOUNT', 'HEX')
+
+    def __init__(self, yaml_config: dict = None, columns_to_display: dict = None, randomise: bool = False,
+                 engine: str = 'python', workers: int = 1, seed: int = None,
+                 nullable_dtypes: bool = False, byte_format: str = 'bytearray', memmap_dir: str = None,
+                 backend: str = 'pandas', cache: FrameCache = None,
+                 instrument: Union[bool, Callable[[dict], None]] = False, unique: bool = False,
+                 plan: GenerationPlan = None, memory_budget: int = None) -> None:
         """
         1. Fetch the config to avoid harcoding values in the code.
         2. Determine if stuff should be randomised for experimenting or rigged for unit testing.
-        3. Create the dataframe.
-        4. Insert values such as np.nan, None or 'NONE' to simulate real life rubbish.
-        5. Determine what columns should be displayed in the output dataframe and what types should be those
+        3. Determine what columns should be displayed in the output dataframe and what types should be those
         columns of.
 
+        The dataframe itself is built the first time the df attribute is accessed, see build_dataframe.
+
         Args:
             yaml_config (dict): dictionary to use. If not specified, it will take it from the YAML config file.
             columns_to_display (dict): what columns should be displayed.
             randomise (bool): default False.
+            engine (str): 'python' (default) or 'numpy' for the vectorized generators.
+            workers (int): numpy engine only, number of processes generating the rows.
+            seed (int): root seed of the instance generators. By default, DEFAULT_SEED if not randomised
+                and fresh entropy from the OS otherwise.
+            nullable_dtypes (bool): numeric columns that only receive missing values as rubbish use the
+                pandas nullable Int64/Float64 dtypes instead of float64.
+            byte_format (str): numpy engine only, storage of the BYTE column:
+                'bytearray' (default): one bytearray per row, in an object column.
+                'fixed': one contiguous 'S{length_bytes}' buffer, shown to pandas as an Arrow fixed size binary
+                column without copying it (if pyarrow and pandas >= 1.5 are available).
+                'memmap': same as 'fixed', with the buffer in a temporary np.memmap file for very large runs.
+            memmap_dir (str): directory of the np.memmap files. By default, the system temporary directory.
+            backend (str): numpy engine only, 'pandas' (default) or 'arrow' to build pyarrow tables, see table.
+            cache (FrameCache): cache of the built dataframes, used only when the output is deterministic, i.e.
+                not randomised or with a given seed.
+            instrument (Union[bool, Callable[[dict], None]]): record the time and memory of every stage, see report.
+                A function is also called with the record of every stage when it ends.
+            unique (bool): numpy engine only, ACCOUNT and HEX columns without duplicates, see UNIQUE_TYPES.
+            plan (GenerationPlan): config and columns compiled once, e.g. shared by many instances, instead of
+                yaml_config and columns_to_display.
+            memory_budget (int): numpy engine only, bytes of memory that iter_chunks, agenerate and write_to may use
+                when no chunk_size is given, see budget_chunk_size.
         """
+        if engine not in self.ENGINES:
+            raise ValueError('engine must be one of {}, got {!r}'.format(self.ENGINES, engine))
+        if workers > 1 and engine != 'numpy':
+            raise ValueError("workers > 1 needs engine='numpy'")
+        if byte_format not in self.BYTE_FORMATS:
+            raise ValueError('byte_format must be one of {}, got {!r}'.format(self.BYTE_FORMATS, byte_format))
+        if byte_format != 'bytearray' and engine != 'numpy':
+            raise ValueError("byte_format {!r} needs engine='numpy'".format(byte_format))
+        if backend not in self.BACKENDS:
+            raise ValueError('backend must be one of {}, got {!r}'.format(self.BACKENDS, backend))
+        if backend != 'pandas' and engine != 'numpy':
+            raise ValueError("backend {!r} needs engine='numpy'".format(backend))
+        if unique and engine != 'numpy':
+            raise ValueError("unique needs engine='numpy'")
+        if memory_budget is not None and engine != 'numpy':
+            raise ValueError("memory_budget needs engine='numpy', the python engine can only build whole dataframes")
+        self.engine = engine
+        self.workers = workers
+        self.nullable_dtypes = nullable_dtypes
+        self.byte_format = byte_format
+        self.memmap_dir = memmap_dir
+        self.backend = backend
+        self.unique = unique
+        self.memory_budget = memory_budget
+        # Plan and sizes per row measured by budget_chunk_size, measured again if the plan changes.
+        self._budget_sizes = None
+        self.cache = cache
+        self.instrumentation = Instrumentation(instrument if callable(instrument) else None) if instrument else None
+        if plan is not None:
+            if yaml_config is not None or columns_to_display is not None:
+                raise ValueError('Pass either a plan or yaml_config and columns_to_display, not both')
+            # Copies, so that modifying them only changes this instance, never the shared plan.
+            self.cfg = copy.deepcopy(plan.cfg)
         # Load config dictionary from yaml file
-        self.cfg = yaml_config or self.fetch_yaml_config()
+        elif yaml_config or self.instrumentation is None:
+            self.cfg = yaml_config or self.fetch_yaml_config()
+        else:
+            with self.instrumentation.stage('fetch_yaml_config'):
+                self.cfg = self.fetch_yaml_config()
         # Determine if the output needs to be randomised or rigged.
         self.randomise = randomise
+        # Root seed of the instance, drawn once if random so that all the chunks of a random dataframe match.
+        # The same arguments always give the same dataframe unless the seed is drawn from the OS.
+        self.deterministic = not randomise or seed is not None
+        if seed is None:
+            seed = np.random.SeedSequence().entropy if randomise else self.DEFAULT_SEED
+        self.entropy = seed
+        # Generators of the python engine, owned by the instance. RandomState accepts seeds below 2 ** 32 only.
+        self.random = random.Random(seed)
+        self.np_random = np.random.RandomState(seed % 2 ** 32)
         # If no columns are specified, take the default example columns from the YAML file.
-        self.columns_to_display = columns_to_display or self.cfg['example_columns']
+        self.columns_to_display = copy.deepcopy(plan.columns_to_display) if plan is not None else \
+            columns_to_display or self.cfg['example_columns']
+        # Checks the config and the columns.
+        self._plan = plan or GenerationPlan(self.cfg, self.columns_to_display)
+        datetime_output = self.cfg.get('datetime_output', 'string')
+        if datetime_output != 'string' and engine != 'numpy':
+            raise ValueError("datetime_output {!r} needs engine='numpy'".format(datetime_output))
+
+        self._df = None
+        self._table = None
+        # Rows already generated by append_rows, where the next call continues.
+        self.rows_generated = 0
+
+    @property
+    def plan(self) -> GenerationPlan:
+        """
+        Compiled config and columns, compiled again if cfg or columns_to_display are replaced or modified
+        in place.
+
+        Returns: GenerationPlan
+
+        """
+        if not self._plan.is_compiled_from(self.cfg, self.columns_to_display):
+            self._plan = GenerationPlan(self.cfg, self.columns_to_display)
+        return self._plan
+
+    @property
+    def report(self) -> list:
+        """
+        Records of the stages run so far if instrumented, in the order they ended: stage, depth (of
+        nesting), rows, seconds, allocated_bytes (still allocated at the end) and peak_bytes.
+
+        Returns: list
+            of dict, empty if not instrumented.
+
+        """
+        return [] if self.instrumentation is None else self.instrumentation.records
+
+    @property
+    def table(self):
+        """
+        Arrow backend: the output as a pyarrow.Table, built on first access.
+
+        Returns: pa.Table
 
+        """
+        if self.backend != 'arrow':
+            raise ValueError("table needs backend='arrow'")
+        if self._table is None:
+            self._table = self.generate_all_rows()
+        return self._table
+
+    @property
+    def df(self) -> pd.DataFrame:
+        # Built on first access, so that streaming with iter_chunks never holds the whole dataframe.
+        if self._df is None:
+            if self.cache is not None and self.deterministic:
+                self._df = self.cache.get_or_build(self.cache_key(), self.build_dataframe)
+            else:
+                self._df = self.build_dataframe()
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self._df = df
+
+    def cache_key(self) -> str:
+        """
+        Key of the dataframe of this instance in a FrameCache: hash of the config, the seed, the columns
+        and every option changing the output.
+
+        Returns: str
+
+        """
+        return frame_key(self.cfg, self.entropy, self.columns_to_display, randomise=self.randomise,
+                         engine=self.engine, nullable_dtypes=self.nullable_dtypes, byte_format=self.byte_format,
+                         backend=self.backend, unique=self.unique)
+
+    @instrumented
+    def build_dataframe(self) -> pd.DataFrame:
+        """
+        1. Create the dataframe.
+        2. Insert values such as np.nan, None or 'NONE' to simulate real life rubbish.
+        3. Display only the specified column types with the specified names.
+
+        Returns: pd.DataFrame
+
+        """
+        if self.backend == 'arrow':
+            return self.table.to_pandas()
+        if self.engine == 'numpy':
+            return self.generate_all_rows()
         # Create the dataframe without rubbish values
-        self.df = self.create_dataframe()
+        df = self.create_dataframe()
         # Insert the rubbish
-        self.df = self.insert_rubbish_to_df(self.df)
+        df = self.insert_rubbish_to_df(df)
+        if self.randomise:
+            # Already one column per output name.
+            return df
         # Display only the specified column types with the specified names
-        self.df = self.select_columns_to_display(self.df)
-        self.df = self.change_column_names(self.df)
+        df = self.select_columns_to_display(df)
+        return self.change_column_names(df)
+
+    def generate_all_rows(self):
+        """
+        Numpy engine: all the dataframe_rows, with the pool of workers if any.
+
+        Returns: Union[pd.DataFrame, pa.Table]
+            depending on the backend.
+
+        """
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return self.generate_rows_in_pool(pool, 0, self.cfg['dataframe_rows'])
+        return self.generate_rows(0, self.cfg['dataframe_rows'])
 
     @staticmethod
     def fetch_yaml_config(yaml_file: str = YAML_FILE_DEFAULT) -> dict:
@@ -95,32 +330,83 @@ class DummyDataframe:
 
         Returns: dict
         """
-        with open(yaml_file, 'r') as ymlfile:
-            return yaml.safe_load(ymlfile)
+        return load_yaml_config(yaml_file)
 
     def initialise_seed(self) -> None:
         """
-        Rig Both random and np.random seeds to produce always the same outputs. It must be
-        called before each method that uses either of the above modules.
+        Rig both random and np.random generators of the instance to produce always the same outputs.
+        It must be called before each method that uses either of them.
 
         Returns: None
 
         """
         if not self.randomise:
-            random.seed(10)
-            np.random.seed(10)
+            self.random.seed(self.entropy)
+            self.np_random.seed(self.entropy % 2 ** 32)
 
-    def generate_list_with_random_strings(self) -> list:
+    def seed_column(self, name: str) -> None:
+        """
+        Randomised python engine: seed both random and np.random generators of the instance from the
+        root seed and the name of an output column, so that every column has its own stream and its
+        values do not depend on the other columns requested.
+
+        Args:
+            name (str): name of the output column.
+
+        Returns: None
+
+        """
+        seed_sequence = np.random.SeedSequence(self.entropy, spawn_key=(self.plan.stream_key(name),))
+        self.random.seed(int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little'))
+        self.np_random.seed(seed_sequence.generate_state(4))
+
+    @instrumented(detail=lambda column_type, *args, **kwargs: column_type)
+    def generate_column(self, column_type: str, start: int, stop: int, name: str = None) -> Union[list, np.ndarray]:
+        """
+        Generate the rows [start, stop) of a column type with its batched generator from the registry,
+        see GenerationPlan.generate. The values of a row do not depend on the range
+        it is generated in, nor on the other columns generated.
+
+        Args:
+            column_type (str): registered column type, see column_types.
+            start (int): first row, included.
+            stop (int): last row, excluded.
+            name (str): name of the output column, which identifies its random stream. By default,
+                the column type.
+
+        Returns: Union[list, np.ndarray]
+
+        """
+        plan = self.plan
+        stream = plan.stream_key(column_type if name is None else name)
+        if self.unique and column_type in self.UNIQUE_TYPES:
+            keys = np.random.SeedSequence(self.entropy, spawn_key=(stream,)).generate_state(8, dtype=np.uint64)
+            if column_type == 'ACCOUNT':
+                return vectorized.unique_accounts(keys, start, stop)
+            return vectorized.unique_hexadecimal_digits(keys, start, stop, self.cfg['hex_number_length'])
+        fixed_bytes = self.byte_format != 'bytearray'
+        out = None
+        if column_type == 'BYTE' and self.byte_format == 'memmap' and stop > start:
+            # The temporary file is deleted as soon as the memmap is closed.
+            out = np.memmap(tempfile.TemporaryFile(dir=self.memmap_dir), mode='w+', shape=(stop - start,),
+                            dtype=plan.generator(column_type, fixed_bytes)[2])
+        return plan.generate(column_type, self.entropy, stream, start, stop, out=out, fixed_bytes=fixed_bytes)
+
+    @instrumented
+    def generate_list_with_random_strings(self) -> Union[list, np.ndarray]:
+        if self.engine == 'numpy':
+            return self.generate_column('STRING', 0, self.cfg['dataframe_rows'])
         # Randomise if argument randomise was passed as True
         self.initialise_seed()
-        characters_to_choose_from = \
-            string.ascii_lowercase + string.ascii_uppercase + '1234567890' + r'+_#@ñó´,' r'aq´ç+¡|@#~€¬ '
-        return [''.join(random.choices(characters_to_choose_from, k=self.cfg['length_strings']))
+        return [''.join(self.random.choices(vectorized.CHARACTERS_TO_CHOOSE_FROM, k=self.cfg['length_strings']))
                 for _ in range(self.cfg['dataframe_rows'])]
 
+    @instrumented
     def generate_list_with_random_bytes(self) -> list:
+        if self.engine == 'numpy':
+            return self.generate_column('BYTE', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
-        return [bytearray(random.getrandbits(8) for _ in range(self.cfg['length_bytes']))
+        return [bytearray(self.random.getrandbits(8) for _ in range(self.cfg['length_bytes']))
                 for _ in range(self.cfg['dataframe_rows'])]
 
     def add_hour_minute_second_to_date(self, datetime_var: datetime) -> datetime:
@@ -139,16 +425,16 @@ class DummyDataframe:
         """
         self.initialise_seed()
         datetime_var = datetime_var.replace(
-            hour=random.randint(0, 23),
-            minute=random.randint(0, 59),
-            second=random.randint(0, 59)
+            hour=self.random.randint(0, 23),
+            minute=self.random.randint(0, 59),
+            second=self.random.randint(0, 59)
         )
         return datetime_var
 
     def adapt_datetime_to_format(self, datetime_var: datetime) -> str:
         """
         1. Add random hour/minute/second to given date.
-        2. Convert to string with format '%d.%m.%Y %H:%M:%S'
+        2. Convert to string with the datetime_format of the config, by default '%d.%m.%Y %H:%M:%S'
 
         Args:
             datetime_var (datetime): to be adapted as string with random H, m, s
@@ -158,60 +444,87 @@ class DummyDataframe:
 
         """
         datetime_var = self.add_hour_minute_second_to_date(datetime_var)
-        return datetime_var.strftime('%d.%m.%Y %H:%M:%S')
+        return datetime_var.strftime(self.cfg.get('datetime_format', vectorized.DATETIME_FORMAT))
 
-    def generate_list_with_random_datetimes(self) -> list:
+    @instrumented
+    def generate_list_with_random_datetimes(self) -> Union[list, np.ndarray]:
+        if self.engine == 'numpy':
+            return self.generate_column('DATETIME', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
-        daterange_to_choose = pd.date_range(self.cfg['datetime_start'], self.cfg['datetime_end'], freq='M')
-        return list(map(self.adapt_datetime_to_format, [random.choice(daterange_to_choose)
+        daterange_to_choose = self.plan.month_ends
+        return list(map(self.adapt_datetime_to_format, [self.random.choice(daterange_to_choose)
                                                         for _ in range(self.cfg['dataframe_rows'])]))
 
-    def generate_list_with_random_accounts(self) -> list:
+    @instrumented
+    def generate_list_with_random_accounts(self) -> Union[list, np.ndarray]:
+        if self.engine == 'numpy':
+            return self.generate_column('ACCOUNT', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
-        return [random.randrange(1, 999999999999, 1) for _ in range(self.cfg['dataframe_rows'])]
+        return [self.random.randrange(1, 999999999999, 1) for _ in range(self.cfg['dataframe_rows'])]
 
+    @instrumented
     def generate_list_with_random_floats(self) -> np.ndarray:
+        if self.engine == 'numpy':
+            return self.generate_column('FLOAT', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
-        return np.array(np.random.randn(self.cfg['dataframe_rows']), dtype=float)
+        return np.array(self.np_random.randn(self.cfg['dataframe_rows']), dtype=float)
 
+    @instrumented
     def generate_list_with_random_integers(self) -> np.ndarray:
+        if self.engine == 'numpy':
+            return self.generate_column('INTEGER', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
         # Return type must be int64
-        return np.array(np.random.randint(0, self.cfg['max_integer'], self.cfg['dataframe_rows']), dtype=np.int64)
+        return np.array(self.np_random.randint(0, self.cfg['max_integer'], self.cfg['dataframe_rows']), dtype=np.int64)
 
-    def generate_list_with_random_hexadecimal_digits(self) -> list:
+    @instrumented
+    def generate_list_with_random_hexadecimal_digits(self) -> Union[list, np.ndarray]:
+        if self.engine == 'numpy':
+            return self.generate_column('HEX', 0, self.cfg['dataframe_rows'])
         self.initialise_seed()
-        HEXDIGITS = '0123456789ABCDEF'
-        return [''.join([HEXDIGITS[random.randint(0, 0xF)] for _ in range(self.cfg['hex_number_length'])]) for __ in
-                range(self.cfg['dataframe_rows'])]
+        HEXDIGITS = vectorized.HEXDIGITS
+        return [''.join([HEXDIGITS[self.random.randint(0, 0xF)] for _ in range(self.cfg['hex_number_length'])])
+                for __ in range(self.cfg['dataframe_rows'])]
 
+    @instrumented
     def create_dataframe(self) -> pd.DataFrame:
         """
-        Using the random lists generated, create a dataframe.
+        Using the random lists generated, create a dataframe. Only the column types in
+        columns_to_display are generated. Column types registered on top of the built-in ones are
+        generated with their batched generator, after the built-in ones.
+
+        If not randomised, the generators are seeded again before every type (historic outputs), so
+        there is one column per type, named after it. If randomised, there is one column per output
+        name, each drawn from its own stream, see seed_column: a type requested under two names
+        gives two different columns.
 
         Returns: pd.DataFrame
-            with the different column types.
-
-        """
-        array_strings = self.generate_list_with_random_strings()
-        array_bytes = self.generate_list_with_random_bytes()
-        array_datetimes = self.generate_list_with_random_datetimes()
-        array_accounts = self.generate_list_with_random_accounts()
-        array_floats = self.generate_list_with_random_floats()
-        array_integers = self.generate_list_with_random_integers()
-        array_hex = self.generate_list_with_random_hexadecimal_digits()
-
-        return pd.DataFrame(
-            {
-                'STRING': array_strings,
-                'DATETIME': array_datetimes,
-                'FLOAT': array_floats,
-                'INTEGER': array_integers,
-                'BYTE': array_bytes,
-                'ACCOUNT': array_accounts,
-                'HEX': array_hex
-            }
-        )
+            with the different column types, or the output columns if randomised.
+
+        """
+        generators = {
+            'STRING': self.generate_list_with_random_strings,
+            'DATETIME': self.generate_list_with_random_datetimes,
+            'FLOAT': self.generate_list_with_random_floats,
+            'INTEGER': self.generate_list_with_random_integers,
+            'BYTE': self.generate_list_with_random_bytes,
+            'ACCOUNT': self.generate_list_with_random_accounts,
+            'HEX': self.generate_list_with_random_hexadecimal_digits
+        }
+        if self.randomise:
+            columns = {}
+            for name, column_type in self.columns_to_display.items():
+                self.seed_column(name)
+                columns[name] = generators[column_type]() if column_type in generators \
+                    else self.generate_column(column_type, 0, self.cfg['dataframe_rows'], name=name)
+            return pd.DataFrame(columns)
+        requested_types = set(self.columns_to_display.values())
+        columns = {column_type: generators[column_type]() for column_type in self.COLUMN_TYPES
+                   if column_type in requested_types}
+        for column_type in self.columns_to_display.values():
+            if column_type not in columns:
+                columns[column_type] = self.generate_column(column_type, 0, self.cfg['dataframe_rows'])
+        return pd.DataFrame(columns)
 
     def insert_random_values_to_df(self, df: pd.DataFrame, value_to_insert: Union[float, str, None] = np.nan,
                                    probability: float = 0.05) -> pd.DataFrame:
@@ -228,28 +541,478 @@ class DummyDataframe:
 
         """
         self.initialise_seed()
-        mask = np.random.random(df.shape) < probability
+        mask = self.draw_uniform_per_cell(df) < probability
         return df.where(~mask, other=value_to_insert)
 
-    def insert_rubbish_to_df(self, df: pd.DataFrame) -> pd.DataFrame:
+    def draw_uniform_per_cell(self, df: pd.DataFrame) -> np.ndarray:
         """
-        Based on the config dictionary, insert config values with config probability.
+        Python engine: one uniform draw in [0, 1) per cell of the dataframe. If randomised, every
+        column draws from its own stream, keyed by the root seed and its name. Otherwise, so that the
+        rubbish of a column does not depend on the other columns requested:
+            - built-in type columns draw from their position in a dataframe with all the types.
+            - registered column types draw from their own stream, as if randomised.
+            - any other columns, e.g. of a dataframe given by the caller, draw all together.
+
+        Args:
+            df (pd.DataFrame): dataframe whose shape is drawn.
+
+        Returns: np.ndarray
+            with the shape of df.
+
+        """
+        uniform = np.empty(df.shape)
+        built_in = [position for position, name in enumerate(df.columns)
+                    if not self.randomise and name in self.COLUMN_TYPES]
+        own_stream = [position for position, name in enumerate(df.columns)
+                      if self.randomise or (name not in self.COLUMN_TYPES and name in column_types.REGISTRY)]
+        others = [position for position in range(df.shape[1]) if position not in built_in + own_stream]
+        if built_in:
+            positions = [self.COLUMN_TYPES.index(df.columns[position]) for position in built_in]
+            uniform[:, built_in] = self.np_random.random((len(df), len(self.COLUMN_TYPES)))[:, positions]
+        for position in own_stream:
+            uniform[:, position] = vectorized.generate_range(
+                vectorized.random_uniform, self.entropy, self.plan.rubbish_stream_key(df.columns[position]), 0, len(df))
+        if others:
+            uniform[:, others] = self.np_random.random((len(df), len(others)))
+        return uniform
+
+    @instrumented
+    def insert_rubbish_to_df(self, df: pd.DataFrame, start: int = 0) -> pd.DataFrame:
+        """
+        Based on the config dictionary, insert config values with config probability, in a single pass:
+        one draw per cell decides which rubbish value, if any, replaces it.
+
+        With the python engine, a rubbish value overwrites the ones before it in the config, as if they
+        were inserted one after the other: if not randomised, every value is drawn against the same
+        uniform draw (historic outputs), otherwise against independent ones. Only the columns that
+        receive rubbish change dtype, see replace_with_rubbish.
 
         Args:
             df (pd.DataFrame): dataframe in which random values are to be inserted.
+            start (int): numpy engine only, position of the first row of df in the whole dataframe.
+
+        Returns: pd.DataFrame
+
+
+        """
+        if self.engine == 'numpy':
+            return pd.DataFrame(
+                {column: self.insert_rubbish_to_column(df[column], start) for column in df.columns},
+                index=df.index
+            )
+        rubbish = self.plan.rubbish
+        probabilities = self.plan.rubbish_probabilities
+        self.initialise_seed()
+        uniform = self.draw_uniform_per_cell(df)
+        if self.randomise:
+            codes = vectorized.rubbish_codes(uniform, self.plan.last_rubbish_probabilities)
+        else:
+            codes = np.full(uniform.shape, -1, dtype=vectorized.rubbish_code_dtype(len(probabilities)))
+            for code, probability in enumerate(probabilities):
+                codes[uniform < probability] = code
+        columns = {}
+        for position, column in enumerate(df.columns):
+            column_codes = codes[:, position]
+            columns[column] = self.replace_with_rubbish(
+                df[column], column_codes, rubbish, np.unique(column_codes[column_codes >= 0]))
+        return pd.DataFrame(columns, index=df.index)
+
+    def replace_with_rubbish(self, column: pd.Series, codes: np.ndarray, rubbish: list,
+                             possible_codes: Iterable[int]) -> pd.Series:
+        """
+        Replace the cells of a column by the rubbish values given by codes. The dtype of the output
+        depends on the rubbish values that may be inserted, given by possible_codes:
+            - none: the column is returned untouched.
+            - only missing values (NaN, None) in a numeric column: float64 with NaN, or the pandas
+            nullable Int64/Float64 dtypes with <NA> if nullable_dtypes is set.
+            - only missing values in an Arrow backed column (e.g. fixed BYTE): same Arrow type with nulls.
+            - only missing values in a datetime64 column: same dtype with NaT.
+            - otherwise, i.e. strings such as 'NULL' or ' ': object.
+
+        Args:
+            column (pd.Series): original column.
+            codes (np.ndarray): index in rubbish of the value of each cell, or -1 to keep it.
+            rubbish (list): rubbish values.
+            possible_codes (Iterable[int]): codes that may appear in codes.
+
+        Returns: pd.Series
+
+        """
+        possible_values = [rubbish[code] for code in possible_codes]
+        if not possible_values:
+            return column
+        only_missing = all(pd.isna(value) for value in possible_values)
+        if only_missing and isinstance(column.dtype, getattr(pd, 'ArrowDtype', ())):
+            pa = writers.import_pyarrow()
+            array = pa.array(column.array)
+            values = pd.arrays.ArrowExtensionArray(
+                pa.compute.if_else(pa.array(codes >= 0), pa.scalar(None, type=array.type), array))
+        elif only_missing and column.dtype.kind == 'M':
+            values = column.to_numpy(copy=True)
+            values[codes >= 0] = np.datetime64('NaT')
+        elif only_missing and column.dtype.kind in 'iuf':
+            mask = codes >= 0
+            if self.nullable_dtypes:
+                # Masked arrays keep the native values and only add a boolean mask.
+                if column.dtype.kind == 'f':
+                    values = pd.arrays.FloatingArray(column.to_numpy(dtype=np.float64), mask)
+                else:
+                    values = pd.arrays.IntegerArray(column.to_numpy(dtype=np.int64), mask)
+            else:
+                values = column.to_numpy(dtype=float, copy=True)
+                values[mask] = np.nan
+        else:
+            values = column.to_numpy(dtype=object, copy=True)
+            for code, value in zip(possible_codes, possible_values):
+                values[codes == code] = value
+        return pd.Series(values, index=column.index, name=column.name)
+
+    def insert_rubbish_to_column(self, column: pd.Series, start: int = 0) -> pd.Series:
+        """
+        Numpy engine: one categorical draw per cell decides which rubbish value, if any, replaces it.
+        The dtype of the output only depends on the config, never on the cells drawn, so that every
+        chunk of a dataframe gets the same dtypes, see replace_with_rubbish.
+
+        Args:
+            column (pd.Series): column in which random values are to be inserted.
+            start (int): position of the first row of column in the whole dataframe.
+
+        Returns: pd.Series
+
+        """
+        codes = self.draw_rubbish_codes(column.name, start, start + len(column))
+        return self.replace_with_rubbish(column, codes, self.plan.rubbish, self.plan.possible_rubbish_codes)
+
+    def draw_rubbish_codes(self, name: str, start: int, stop: int) -> np.ndarray:
+        """
+        Numpy engine: rubbish codes of the rows [start, stop) of a column, see vectorized.rubbish_codes.
+
+        Args:
+            name (str): name of the output column, which identifies its random stream.
+            start (int): first row, included.
+            stop (int): last row, excluded.
+
+        Returns: np.ndarray
+
+        """
+        return vectorized.generate_range(
+            vectorized.random_rubbish_codes, self.entropy, self.plan.rubbish_stream_key(name), start, stop,
+            probabilities=self.plan.rubbish_probabilities)
+
+    @instrumented
+    def generate_rows(self, start: int, stop: int) -> pd.DataFrame:
+        """
+        Numpy engine: rows [start, stop) of the output dataframe, with the rubbish inserted and the
+        configured columns and names. The result is the same slice of the whole dataframe.
+        Every column is generated directly under its output name, from its own random stream, so
+        only the requested types are generated and a type requested twice gives two different columns.
+
+        Args:
+            start (int): first row, included.
+            stop (int): last row, excluded.
 
         Returns: pd.DataFrame
+            indexed from start to stop, or a pa.Table with the arrow backend, see generate_table.
+
+        """
+        if self.backend == 'arrow':
+            return self.generate_table(start, stop)
+        columns = {}
+        for name, column_type in self.columns_to_display.items():
+            columns[name] = self.generate_column(column_type, start, stop, name=name)
+            if column_type == 'BYTE' and self.byte_format != 'bytearray':
+                columns[name] = vectorized.fixed_bytes_to_pandas(columns[name])
+        df = pd.DataFrame(columns, index=pd.RangeIndex(start, stop))
+        return self.insert_rubbish_to_df(df, start=start)
+
+    @instrumented
+    def generate_table(self, start: int, stop: int):
+        """
+        Arrow backend: same as generate_rows, but every column goes straight from its numpy buffer
+        to an Arrow array, with the rubbish inserted as explained in arrow_backend.
+
+        Args:
+            start (int): first row, included.
+            stop (int): last row, excluded.
+
+        Returns: pa.Table
+
+        """
+        pa = writers.import_pyarrow()
+        rubbish = self.plan.rubbish
+        arrays = [
+            arrow_backend.to_arrow_with_rubbish(
+                self.generate_column(column_type, start, stop, name=name), self.draw_rubbish_codes(name, start, stop),
+                rubbish)
+            for name, column_type in self.columns_to_display.items()
+        ]
+        return pa.Table.from_arrays(arrays, names=[str(name) for name in self.columns_to_display])
+
+    def budget_chunk_size(self, chunk_size: int = None, chunks_held: int = 1) -> int:
+        """
+        Numpy engine: rows of each chunk. If no chunk_size is given, the most rows whose generation fits in
+        memory_budget, from the sizes per row measured on a sample (see sizing.measure), or CHUNK_SIZE
+        without a memory_budget.
+
+        Args:
+            chunk_size (int): rows of each chunk, returned as it is if given.
+            chunks_held (int): chunks kept in memory while the next one is generated, e.g. by the consumer.
+
+        Returns: int
+
+        """
+        if chunk_size is not None:
+            if chunk_size < 1:
+                raise ValueError('chunk_size must be positive, got {}'.format(chunk_size))
+            return chunk_size
+        if self.memory_budget is None:
+            return self.CHUNK_SIZE
+        if self._budget_sizes is None or self._budget_sizes[0] is not self.plan:
+            self._budget_sizes = self.plan, sizing.measure(self, formats=())['memory'][self.backend]
+        sizes = self._budget_sizes[1]
+        # With workers, the parts sent back by the pool are also held until they are concatenated.
+        row_bytes = sizes['peak_row_bytes'] + (chunks_held + (self.workers > 1)) * sizes['row_bytes']
+        chunk_size = int(self.memory_budget // row_bytes)
+        if chunk_size < 1:
+            raise ValueError('memory_budget of {} bytes cannot hold a single row, which needs about {:.0f} bytes'
+                             .format(self.memory_budget, row_bytes))
+        # Whole blocks, so that no block is drawn by two chunks.
+        return chunk_size - chunk_size % vectorized.BLOCK_ROWS if chunk_size >= vectorized.BLOCK_ROWS else chunk_size
+
+    def iter_chunks(self, total_rows: int = None, chunk_size: int = None,
+                    first_row: int = 0) -> Iterator[pd.DataFrame]:
+        """
+        Numpy engine: yield the dataframe chunk by chunk, so that the memory used only depends on
+        chunk_size. Concatenating the chunks gives the same dataframe, whatever the chunk_size.
+
+        Args:
+            total_rows (int): rows of the whole dataframe. By default, dataframe_rows from the config.
+            chunk_size (int): maximum rows of each chunk. By default, see budget_chunk_size.
+            first_row (int): first row of the first chunk, to yield only the rows [first_row, total_rows),
+                e.g. a shard, without generating the rows before it.
+
+        Returns: Iterator[pd.DataFrame]
+            or Iterator[pa.Table] with the arrow backend.
+
+        """
+        if self.engine != 'numpy':
+            raise ValueError("iter_chunks needs engine='numpy', the python engine can only build whole dataframes")
+        chunk_size = self.budget_chunk_size(chunk_size)
+        total_rows = self.cfg['dataframe_rows'] if total_rows is None else total_rows
+        if self.workers > 1:
+            # Every chunk is split across the pool, so the memory still only depends on chunk_size.
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for start in range(first_row, total_rows, chunk_size):
+                    yield self.generate_rows_in_pool(pool, start, min(start + chunk_size, total_rows))
+        else:
+            for start in range(first_row, total_rows, chunk_size):
+                yield self.generate_rows(start, min(start + chunk_size, total_rows))
+
+    async def agenerate(self, total_rows: int = None, chunk_size: int = None, prefetch: int = 2,
+                        executor: Executor = None) -> AsyncIterator[pd.DataFrame]:
+        """
+        Numpy engine: asynchronous version of iter_chunks, for async for. The chunks are generated in
+        an executor, so the event loop keeps running, and at most prefetch of them wait in a queue for
+        the consumer: generation pauses when the consumer is slower, so the memory stays bounded.
+        Leaving the loop, or cancelling the task consuming it, stops the generation. A chunk already
+        running in the executor is finished and discarded.
+
+        Args:
+            total_rows (int): rows of the whole dataframe. By default, dataframe_rows from the config.
+            chunk_size (int): maximum rows of each chunk. By default, see budget_chunk_size, with the
+                prefetched chunks counted in the memory_budget.
+            prefetch (int): maximum chunks generated ahead of the consumer.
+            executor (Executor): where the chunks are generated. By default, the default executor of the loop.
+
+        Returns: AsyncIterator[pd.DataFrame]
+            or AsyncIterator[pa.Table] with the arrow backend.
+
+        """
+        if self.engine != 'numpy':
+            raise ValueError("agenerate needs engine='numpy', the python engine can only build whole dataframes")
+        if prefetch < 1:
+            raise ValueError('prefetch must be positive, got {}'.format(prefetch))
+        chunk_size = self.budget_chunk_size(chunk_size, chunks_held=prefetch + 1)
+        total_rows = self.cfg['dataframe_rows'] if total_rows is None else total_rows
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=prefetch)
+        worker = self if executor is None else self.worker_copy()
+
+        async def produce() -> None:
+            try:
+                for start in range(0, total_rows, chunk_size):
+                    chunk = await loop.run_in_executor(
+                        executor, worker.generate_rows, start, min(start + chunk_size, total_rows))
+                    await queue.put(chunk)
+            except Exception as error:
+                # Raised to the consumer instead of leaving it waiting for the next chunk.
+                await queue.put(error)
+            else:
+                await queue.put(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                chunk = await queue.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            producer.cancel()
+
+    def append_rows(self, rows: int) -> pd.DataFrame:
+        """
+        Numpy engine: the next rows of the dataset, continuing where the previous call stopped, so
+        that the successive outputs are consecutive chunks of one dataframe. Only the new rows are
+        generated, whatever the rows generated before.
+
+        Args:
+            rows (int): number of rows to generate.
+
+        Returns: pd.DataFrame
+            indexed from rows_generated, or a pa.Table with the arrow backend.
+
+        """
+        if self.engine != 'numpy':
+            raise ValueError("append_rows needs engine='numpy', the python engine can only build whole dataframes")
+        chunk = self.generate_rows(self.rows_generated, self.rows_generated + rows)
+        self.rows_generated += rows
+        return chunk
+
+    def get_state(self) -> dict:
+        """
+        Numpy engine: JSON serializable state from which from_state continues the dataset, in any process.
+
+        Returns: dict
+            with the format version, root seed, rows generated, config, columns and options.
+
+        """
+        if self.engine != 'numpy':
+            raise ValueError("get_state needs engine='numpy', the python engine cannot continue a dataframe")
+        return {
+            'version': state.STATE_VERSION,
+            'entropy': self.entropy,
+            'rows_generated': self.rows_generated,
+            'config': state.encode(self.cfg),
+            'columns_to_display': state.encode(self.columns_to_display),
+            'options': {'randomise': self.randomise, 'nullable_dtypes': self.nullable_dtypes,
+                        'byte_format': self.byte_format, 'backend': self.backend, 'unique': self.unique},
+        }
+
+    @classmethod
+    def from_state(cls, saved_state: dict, **kwargs) -> 'DummyDataframe':
+        """
+        Restore an instance saved with get_state, so that append_rows continues the same dataset.
+
+        Args:
+            saved_state (dict): output of get_state, e.g. loaded from a JSON file.
+            **kwargs: other arguments of the instance that do not change the output, e.g. workers.
+
+        Returns: DummyDataframe
+
+        """
+        if saved_state.get('version') != state.STATE_VERSION:
+            raise ValueError('Unsupported state version {!r}, expected {}'.format(
+                saved_state.get('version'), state.STATE_VERSION))
+        dummy = cls(yaml_config=state.decode(saved_state['config']),
+                    columns_to_display=state.decode(saved_state['columns_to_display']), engine='numpy',
+                    seed=saved_state['entropy'], **dict(saved_state['options'], **kwargs))
+        dummy.rows_generated = saved_state['rows_generated']
+        return dummy
+
+    def write_to(self, path: str, format: str = None, rows: int = None, chunk_size: int = None,
+                 first_row: int = 0) -> dict:
+        """
+        Write the dataframe to a file. With the numpy engine, the chunks are written as soon as they are
+        generated, so the memory used only depends on chunk_size. The python engine writes the whole df.
+
+        Args:
+            path (str): output file.
+            format (str): 'csv', 'parquet' or 'feather'. By default, inferred from the extension of path.
+            rows (int): numpy engine only, rows to write. By default, dataframe_rows from the config.
+            chunk_size (int): numpy engine only, maximum rows of each chunk. By default, see budget_chunk_size,
+                with the copy made by the writer counted in the memory_budget.
+            first_row (int): numpy engine only, first row written, e.g. of a shard.
+
+        Returns: dict
+            with the path, rows, seconds, rows_per_second and bytes written.
+
+        """
+        if self.engine == 'numpy':
+            rows = self.cfg['dataframe_rows'] if rows is None else rows
+            chunks = self.iter_chunks(first_row + rows, self.budget_chunk_size(chunk_size, chunks_held=2), first_row)
+        elif first_row == 0 and (rows is None or rows == self.cfg['dataframe_rows']):
+            chunks = [self.df]
+        else:
+            raise ValueError("rows and first_row need engine='numpy', the python engine can only write the whole df")
+        binary_columns = [name for name, column_type in self.columns_to_display.items() if column_type == 'BYTE']
+        start = time.perf_counter()
+        rows = writers.write_chunks(chunks, path, format, binary_columns)
+        seconds = time.perf_counter() - start
+        return {'path': path, 'rows': rows, 'seconds': seconds, 'rows_per_second': rows / (seconds or float('nan')),
+                'bytes': os.path.getsize(path)}
+
+    @classmethod
+    def build_many(cls, arguments: Iterable[dict], max_workers: int = None) -> list:
+        """
+        Build many dataframes at once in a pool of threads. Each instance owns its generators, so
+        the results are the same as building them one after the other.
+
+        Args:
+            arguments (Iterable[dict]): keyword arguments of each instance, e.g. [{'seed': 1}, {'seed': 2}].
+            max_workers (int): number of threads. By default, the ThreadPoolExecutor default.
+
+        Returns: list
+            of pd.DataFrame, in the order of arguments.
+
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda kwargs: cls(**kwargs).df, arguments))
+
+    def generate_rows_in_pool(self, pool: Executor, start: int, stop: int) -> pd.DataFrame:
+        """
+        Numpy engine: same as generate_rows, but the rows are split at block boundaries across the
+        workers of the pool. Every block has its own random stream spawned from the root seed, so the
+        output does not depend on how the rows are split.
+
+        Args:
+            pool (Executor): pool of workers.
+            start (int): first row, included.
+            stop (int): last row, excluded.
+
+        Returns: pd.DataFrame
+
+        """
+        ranges = vectorized.split_range(start, stop, self.workers)
+        if len(ranges) < 2:
+            return self.generate_rows(start, stop)
+        worker = self.worker_copy()
+        starts, stops = zip(*ranges)
+        if self.backend == 'arrow':
+            return writers.import_pyarrow().concat_tables(pool.map(worker.generate_rows, starts, stops))
+        return pd.concat(pool.map(worker.generate_rows, starts, stops))
+
+    def worker_copy(self) -> 'DummyDataframe':
+        """
+        Copy of the instance sent to the workers of a pool: without the dataframe, which may have been
+        built already and is not needed, nor the cache and the instrumentation, which stay in this process.
 
+        Returns: DummyDataframe
 
         """
-        for value, prob in self.cfg['rubbish_to_insert'].items():
-            df = self.insert_random_values_to_df(df, value_to_insert=value, probability=prob)
-        return df
+        worker = copy.copy(self)
+        worker._df = worker._table = None
+        worker.cache = worker.instrumentation = None
+        return worker
 
+    @instrumented
     def select_columns_to_display(self, df: pd.DataFrame) -> pd.DataFrame:
         # Return only the configured column names.
         return df[self.columns_to_display.values()]
 
+    @instrumented
     def change_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
         # Change to the configured column names.
         return df.set_axis(self.columns_to_display.keys(), axis=1)
@@ -0,0 +1,119 @@
+# Optional timing and memory instrumentation of the stages of DummyDataframe, to find where
+# the time of a slow build goes:
+#
+# dummy = DummyDataframe(instrument=True)
+# dummy.df
+# dummy.report  # one record per stage, e.g. {'stage': 'generate_list_with_random_datetimes', ...}
+#
+# Every record is also logged at DEBUG level on the 'dummydf' logger, and passed to the
+# callback if instrument is a function. The memory is measured with tracemalloc, which slows
+# down the Python code, so the times are only comparable between instrumented runs.
+# Without instrument, the stages only check that the instrumentation is None.
+
+"""
+Instrumentation
+"""
+
+import functools
+import logging
+import time
+import tracemalloc
+from typing import Callable, Iterator
+from contextlib import contextmanager
+
+logger = logging.getLogger('dummydf')
+
+
+class Instrumentation:
+    """
+    Records the wall time, the allocated memory and the rows of nested stages.
+
+    """
+
+    def __init__(self, callback: Callable[[dict], None] = None) -> None:
+        """
+        Args:
+            callback (Callable[[dict], None]): called with every record, when its stage ends.
+        """
+        self.callback = callback
+        self.records = []
+        # Stages running, innermost last, with their start memory and the highest peak seen so far.
+        self._running = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """
+        Measure the code run in the context. Nested stages are recorded before the stages containing
+        them, with a bigger depth.
+
+        Args:
+            name (str): name of the stage.
+
+        Returns: Iterator[dict]
+            the record of the stage, whose rows can be set in the context.
+
+        """
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._running:
+            self._running[-1]['peak'] = max(self._running[-1]['peak'], peak)
+        self._reset_peak()
+        record = {'stage': name, 'depth': len(self._running), 'rows': None}
+        self._running.append({'current': current, 'peak': current})
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            seconds = time.perf_counter() - start
+            end_current, end_peak = tracemalloc.get_traced_memory()
+            running = self._running.pop()
+            peak = max(running['peak'], end_peak)
+            if self._running:
+                self._running[-1]['peak'] = max(self._running[-1]['peak'], peak)
+                self._reset_peak()
+            if started_tracing:
+                tracemalloc.stop()
+            record.update(seconds=seconds, allocated_bytes=end_current - running['current'],
+                          peak_bytes=peak - running['current'])
+            self.records.append(record)
+            logger.debug('%s: %s rows in %.6f s, %+d bytes allocated, peak %d bytes', name, record['rows'],
+                         seconds, record['allocated_bytes'], record['peak_bytes'])
+            if self.callback is not None:
+                self.callback(record)
+
+    @staticmethod
+    def _reset_peak() -> None:
+        # Python < 3.9 cannot reset the peak, which is then the peak since the tracing started.
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+
+
+def instrumented(method: Callable = None, detail: Callable = None) -> Callable:
+    """
+    Decorator recording a method of DummyDataframe as a stage when the instance is instrumented.
+    The rows of the stage are the length of the output.
+
+    Args:
+        method (Callable): method to decorate.
+        detail (Callable): takes the arguments of the method and returns a suffix of the stage name,
+            e.g. the column type.
+
+    Returns: Callable
+
+    """
+    if method is None:
+        return functools.partial(instrumented, detail=detail)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.instrumentation is None:
+            return method(self, *args, **kwargs)
+        name = method.__name__ if detail is None else '{}:{}'.format(method.__name__, detail(*args, **kwargs))
+        with self.instrumentation.stage(name) as record:
+            output = method(self, *args, **kwargs)
+            record['rows'] = len(output)
+        return output
+
+    return wrapper
@@ -0,0 +1,204 @@
+# Generation plan: everything DummyDataframe derives from its config, computed once. Building
+# many small dataframes from the same config then only pays for the rows:
+#
+# plan = GenerationPlan.from_yaml(columns_to_display={'BALANCE': 'FLOAT', 'CALL_DATE': 'DATETIME'})
+# dfs = [DummyDataframe(plan=plan, seed=seed).df for seed in range(1000)]
+#
+# A plan checks the config when it is compiled, and holds the rubbish values and probabilities,
+# the month ends of the python engine, the resolved generator of every column type with its
+# parameters and dtype, and the random stream key of every column. It is never modified after
+# compilation (apart from caching the generators of types it was not compiled for), so it can be
+# shared by instances in different threads. It keeps its own copy of the config and columns it
+# was compiled from, and every instance gets another copy of them, so that an instance whose
+# config is then modified, even in place, compiles a new plan for itself (see DummyDataframe.plan)
+# without changing the shared one.
+#
+# YAML files are parsed once per version of the file, see load_yaml_config.
+
+"""
+Generation plan
+"""
+
+import copy
+import functools
+import os
+import numpy as np
+import pandas as pd
+import yaml
+from dummydf import column_types, vectorized
+
+# Keys that every config must have, on top of the keys of its column types.
+REQUIRED_KEYS = ('dataframe_rows', 'rubbish_to_insert')
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_yaml(path: str, modified_ns: int) -> dict:
+    with open(path, 'r') as ymlfile:
+        return yaml.safe_load(ymlfile)
+
+
+def load_yaml_config(yaml_file: str) -> dict:
+    """
+    Parse a YAML config file, only once as long as the file is not modified. Every call returns
+    its own copy, so callers can modify it.
+
+    Args:
+        yaml_file (str): path to the .yml file.
+
+    Returns: dict
+
+    """
+    return copy.deepcopy(_parse_yaml(os.path.abspath(yaml_file), os.stat(yaml_file).st_mtime_ns))
+
+
+class GenerationPlan:
+    """
+    Config of a DummyDataframe, checked and compiled once.
+
+    """
+
+    def __init__(self, cfg: dict, columns_to_display: dict = None) -> None:
+        """
+        Args:
+            cfg (dict): config dictionary.
+            columns_to_display (dict): output column names and types. By default, the example_columns
+                of the config.
+        """
+        # Copies, so that modifying the arguments afterwards does not change the plan, see is_compiled_from.
+        self.cfg = copy.deepcopy(cfg)
+        self.columns_to_display = copy.deepcopy(columns_to_display or cfg['example_columns'])
+        cfg = self.cfg
+        types = [column_types.get_column_type(column_type) for column_type in self.columns_to_display.values()]
+        missing_keys = [key for key in REQUIRED_KEYS + sum((registered.config_keys for registered in types), ())
+                        if key not in cfg]
+        if missing_keys:
+            raise ValueError('The config misses the keys {}'.format(sorted(set(missing_keys))))
+        if not isinstance(cfg['dataframe_rows'], (int, np.integer)) or cfg['dataframe_rows'] < 0:
+            raise ValueError('dataframe_rows must be a non negative integer, got {!r}'.format(cfg['dataframe_rows']))
+        if cfg.get('datetime_output', 'string') not in vectorized.DATETIME_OUTPUTS:
+            raise ValueError('datetime_output must be one of {}, got {!r}'.format(
+                vectorized.DATETIME_OUTPUTS, cfg.get('datetime_output')))
+
+        self.rubbish = list(cfg['rubbish_to_insert'])
+        self.rubbish_probabilities = self._read_only(np.array(list(cfg['rubbish_to_insert'].values()), dtype=float))
+        if ((self.rubbish_probabilities < 0) | (self.rubbish_probabilities > 1)).any():
+            raise ValueError('Rubbish probabilities must be between 0 and 1, got {}'.format(cfg['rubbish_to_insert']))
+        self.possible_rubbish_codes = self._read_only(np.flatnonzero(self.rubbish_probabilities > 0))
+        # Probability of each rubbish value to be the last one inserted in a cell, see insert_rubbish_to_df.
+        later_misses = np.append(np.cumprod((1 - self.rubbish_probabilities)[::-1])[::-1][1:], 1)
+        self.last_rubbish_probabilities = self._read_only(self.rubbish_probabilities * later_misses)
+
+        # Month ends drawn by the python engine.
+        self.month_ends = pd.date_range(cfg['datetime_start'], cfg['datetime_end'], freq='M') \
+            if 'datetime_start' in cfg and 'datetime_end' in cfg else None
+
+        self.stream_keys = {name: vectorized.stream_key(str(name)) for name in self.columns_to_display}
+        self.rubbish_stream_keys = {name: vectorized.stream_key('RUBBISH:{}'.format(name))
+                                    for name in self.columns_to_display}
+        self._generators = {}
+        for column_type in self.columns_to_display.values():
+            self.generator(column_type)
+            if column_type == 'BYTE':
+                self.generator(column_type, fixed_bytes=True)
+
+    @classmethod
+    def from_yaml(cls, yaml_file: str = None, columns_to_display: dict = None) -> 'GenerationPlan':
+        """
+        Args:
+            yaml_file (str): path to the .yml file. By default, the config file of the package.
+            columns_to_display (dict): output column names and types.
+
+        Returns: GenerationPlan
+
+        """
+        default_file = os.path.join(os.path.dirname(__file__), 'config', 'config_dummydf.yml')
+        return cls(load_yaml_config(yaml_file or default_file), columns_to_display)
+
+    def __getstate__(self) -> dict:
+        # The generators may be lambdas, which cannot be pickled: worker processes compile them again.
+        return dict(self.__dict__, _generators={})
+
+    @staticmethod
+    def _read_only(values: np.ndarray) -> np.ndarray:
+        values.setflags(write=False)
+        return values
+
+    def is_compiled_from(self, cfg: dict, columns_to_display: dict) -> bool:
+        """
+        Whether the plan is still valid for a config and columns, e.g. after they were modified in place.
+        Comparing them with a copy only takes about a microsecond, so it is checked whenever the plan is used.
+
+        Args:
+            cfg (dict): config dictionary.
+            columns_to_display (dict): output column names and types.
+
+        Returns: bool
+
+        """
+        return (cfg, columns_to_display) == (self.cfg, self.columns_to_display)
+
+    def generator(self, column_type: str, fixed_bytes: bool = False) -> tuple:
+        """
+        Args:
+            column_type (str): registered column type.
+            fixed_bytes (bool): BYTE stored in one fixed width buffer, see column_types.FIXED_BYTE.
+
+        Returns: tuple
+            (ColumnType, keyword arguments of its generator, dtype of its output).
+
+        """
+        key = (column_type, fixed_bytes and column_type == 'BYTE')
+        if key not in self._generators:
+            registered = column_types.FIXED_BYTE if key[1] else column_types.get_column_type(column_type)
+            self._generators[key] = (registered, registered.parameters(self.cfg), registered.dtype(self.cfg))
+        return self._generators[key]
+
+    def stream_key(self, name: str) -> int:
+        """
+        Args:
+            name (str): name of the stream, e.g. an output column.
+
+        Returns: int
+            see vectorized.stream_key.
+
+        """
+        return self.stream_keys[name] if name in self.stream_keys else vectorized.stream_key(str(name))
+
+    def rubbish_stream_key(self, name: str) -> int:
+        """
+        Args:
+            name (str): output column.
+
+        Returns: int
+            key of the stream of the rubbish codes of the column.
+
+        """
+        if name in self.rubbish_stream_keys:
+            return self.rubbish_stream_keys[name]
+        return vectorized.stream_key('RUBBISH:{}'.format(name))
+
+    def generate(self, column_type: str, entropy: int, stream: int, start: int, stop: int, out: np.ndarray = None,
+                 fixed_bytes: bool = False):
+        """
+        Rows [start, stop) of a column type, with the parameters and dtype compiled in the plan.
+        Every block is drawn into its own array, then concatenated, or copied into out if given.
+
+        Args:
+            column_type (str): registered column type.
+            entropy (int): root seed.
+            stream (int): key of the stream, see stream_key.
+            start (int): first row, included.
+            stop (int): last row, excluded.
+            out (np.ndarray): array of stop - start rows to copy the blocks into, e.g. a np.memmap, so that
+                only one block at a time is held in memory.
+            fixed_bytes (bool): see generator.
+
+        Returns: Union[list, np.ndarray]
+
+        """
+        registered, parameters, dtype = self.generator(column_type, fixed_bytes)
+        values = vectorized.generate_range(registered.generator, entropy, stream, start, stop, out=out, **parameters)
+        if out is None and dtype != object:
+            # Not copied when the generator already outputs the declared dtype.
+            values = values.astype(dtype, copy=False)
+        return values
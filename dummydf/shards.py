@@ -0,0 +1,121 @@
+# Sharding of a big dataset across nodes. A manifest describes the whole dataset (the state of
+# the DummyDataframe, see state) and how its rows are split into shards. Every node generates its
+# own shard from the manifest, without generating any row before it, and the shards put together
+# are exactly the dataset built on a single node:
+#
+# python -m dummydf.shards manifest.json --rows 1000000000 --shards 64 --seed 7
+# python -m dummydf shard_3.parquet --manifest manifest.json --shard 3   # on each node
+#
+# Shards are cut at block boundaries (see vectorized.split_range), so the dataset may have fewer
+# shards than requested when it has few blocks.
+
+"""
+Shards
+"""
+
+import argparse
+import json
+from dummydf import vectorized
+from dummydf.dummydf import DummyDataframe
+
+# Version of the manifest format, checked when reading it.
+MANIFEST_VERSION = 1
+
+
+def make_manifest(dummy: DummyDataframe, total_rows: int = None, shards: int = 1) -> dict:
+    """
+    Args:
+        dummy (DummyDataframe): numpy engine instance generating the dataset.
+        total_rows (int): rows of the dataset. By default, dataframe_rows from the config.
+        shards (int): maximum number of shards.
+
+    Returns: dict
+        JSON serializable manifest, with the state of dummy and the [start, stop) rows of every shard.
+
+    """
+    total_rows = dummy.cfg['dataframe_rows'] if total_rows is None else total_rows
+    ranges = vectorized.split_range(0, total_rows, shards)
+    return {
+        'version': MANIFEST_VERSION,
+        'total_rows': total_rows,
+        'state': dict(dummy.get_state(), rows_generated=0),
+        'shards': [{'index': index, 'start': start, 'stop': stop} for index, (start, stop) in enumerate(ranges)],
+    }
+
+
+def shard_range(manifest: dict, index: int) -> tuple:
+    """
+    Args:
+        manifest (dict): see make_manifest.
+        index (int): index of the shard.
+
+    Returns: tuple
+        (start, stop) rows of the shard.
+
+    """
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError('Unsupported manifest version {!r}, expected {}'.format(
+            manifest.get('version'), MANIFEST_VERSION))
+    if not 0 <= index < len(manifest['shards']):
+        raise ValueError('The manifest has {} shards, got index {}'.format(len(manifest['shards']), index))
+    shard = manifest['shards'][index]
+    return shard['start'], shard['stop']
+
+
+def generate_shard(manifest: dict, index: int, **kwargs):
+    """
+    Args:
+        manifest (dict): see make_manifest.
+        index (int): index of the shard.
+        **kwargs: arguments of the instance that do not change the output, e.g. workers.
+
+    Returns: Union[pd.DataFrame, pa.Table]
+        rows of the shard, indexed as in the whole dataset.
+
+    """
+    start, stop = shard_range(manifest, index)
+    return DummyDataframe.from_state(manifest['state'], **kwargs).generate_rows(start, stop)
+
+
+def write_shard(manifest: dict, index: int, path: str, format: str = None, chunk_size: int = None,
+                **kwargs) -> dict:
+    """
+    Write the rows of a shard to a file, chunk by chunk, see DummyDataframe.write_to.
+
+    Args:
+        manifest (dict): see make_manifest.
+        index (int): index of the shard.
+        path (str): output file.
+        format (str): 'csv', 'parquet' or 'feather'. By default, inferred from the extension of path.
+        chunk_size (int): maximum rows of each chunk. By default, see DummyDataframe.budget_chunk_size.
+        **kwargs: arguments of the instance that do not change the output, e.g. workers or memory_budget.
+
+    Returns: dict
+        see DummyDataframe.write_to.
+
+    """
+    start, stop = shard_range(manifest, index)
+    return DummyDataframe.from_state(manifest['state'], **kwargs).write_to(
+        path, format=format, rows=stop - start, chunk_size=chunk_size, first_row=start)
+
+
+def main(arguments: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='python -m dummydf.shards', description='Write a shard manifest.')
+    parser.add_argument('path', help='output JSON manifest')
+    parser.add_argument('--rows', type=int, help='rows of the dataset, by default dataframe_rows from the config')
+    parser.add_argument('--shards', type=int, required=True, help='maximum number of shards')
+    parser.add_argument('--config', default=DummyDataframe.YAML_FILE_DEFAULT, help='YAML config file')
+    parser.add_argument('--seed', type=int, help='root seed')
+    parser.add_argument('--randomise', action='store_true', help='random output instead of the rigged one')
+    args = parser.parse_args(arguments)
+    dummy = DummyDataframe(yaml_config=DummyDataframe.fetch_yaml_config(args.config), randomise=args.randomise,
+                           engine='numpy', seed=args.seed)
+    manifest = make_manifest(dummy, args.rows, args.shards)
+    with open(args.path, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    print('{} shards of {:,} rows written to {}'.format(len(manifest['shards']), manifest['total_rows'], args.path))
+    return manifest
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+# Size estimates of a DummyDataframe, to know before a big run how much memory and disk it
+# needs, and to size the chunks under a memory budget:
+#
+# sizes = estimate(columns_to_display={'BALANCE': 'FLOAT', 'NAME': 'STRING'}, rows=10 ** 9)
+# sizes['memory']['pandas']['peak_bytes']  # memory needed to build the whole dataframe at once
+# sizes['disk']['parquet']['bytes']        # size of the whole dataframe written to parquet
+#
+# The sizes per row are measured on a sample of rows built exactly as the instance builds them:
+# object columns, the dtypes given by the rubbish and the copies made while inserting it are all
+# accounted for, whatever the column types. The peak is measured with tracemalloc, which does not
+# see the buffers allocated by Arrow, so the size of the Arrow table is added to it. The disk
+# sizes come from writing the sample to temporary files; random values hardly compress, so they
+# grow linearly with the rows.
+
+"""
+Sizing
+"""
+
+import os
+import tempfile
+from typing import Iterable
+from dummydf import writers
+from dummydf.instrumentation import Instrumentation
+
+# Rows of the sample, enough for the fixed costs (headers, footers) to be negligible.
+SAMPLE_ROWS = 4096
+
+
+def available_backends(engine: str) -> tuple:
+    """
+    Args:
+        engine (str): engine of the DummyDataframe.
+
+    Returns: tuple
+        backends that the engine can build here, arrow only if pyarrow is installed.
+
+    """
+    if engine != 'numpy':
+        return 'pandas',
+    try:
+        writers.import_pyarrow()
+    except ImportError:
+        return 'pandas',
+    return 'pandas', 'arrow'
+
+
+def memory_bytes(sample) -> int:
+    """
+    Args:
+        sample (Union[pd.DataFrame, pa.Table]): built rows.
+
+    Returns: int
+        memory taken by the values, Python objects included.
+
+    """
+    if hasattr(sample, 'memory_usage'):
+        return int(sample.memory_usage(deep=True, index=False).sum())
+    return sample.nbytes
+
+
+def measure(dummy, rows: int = None, sample_rows: int = SAMPLE_ROWS,
+            formats: Iterable[str] = writers.FORMATS) -> dict:
+    """
+    Estimate the sizes of the output of an instance from a sample of its rows, see estimate.
+
+    Args:
+        dummy (DummyDataframe): instance to estimate, which is not modified.
+        rows (int): rows of the whole output. By default, dataframe_rows from the config.
+        sample_rows (int): rows of the sample.
+        formats (Iterable[str]): file formats whose size is estimated, parquet and feather only if pyarrow
+            is installed.
+
+    Returns: dict
+        see estimate.
+
+    """
+    if sample_rows < 1:
+        raise ValueError('sample_rows must be positive, got {}'.format(sample_rows))
+    rows = dummy.cfg['dataframe_rows'] if rows is None else rows
+    sampler = dummy.worker_copy()
+    sampler.workers = 1
+    sampler.cfg = dict(dummy.cfg, dataframe_rows=sample_rows)
+    fixed_bytes = dummy.byte_format != 'bytearray'
+    columns = {name: {'type': column_type,
+                      'generated_row_bytes': sampler.plan.generator(column_type, fixed_bytes)[0].row_bytes(sampler.cfg)}
+               for name, column_type in sampler.columns_to_display.items()}
+
+    samples = {}
+    memory = {}
+    for backend in available_backends(dummy.engine):
+        sampler.backend = backend
+        with Instrumentation().stage('sample') as record:
+            samples[backend] = sampler.generate_rows(0, sample_rows) if dummy.engine == 'numpy' \
+                else sampler.build_dataframe()
+        row_bytes = memory_bytes(samples[backend]) / sample_rows
+        peak_row_bytes = (record['peak_bytes'] + (memory_bytes(samples[backend]) if backend == 'arrow' else 0)) \
+            / sample_rows
+        memory[backend] = {'row_bytes': row_bytes, 'bytes': round(row_bytes * rows),
+                           'peak_row_bytes': peak_row_bytes, 'peak_bytes': round(peak_row_bytes * rows)}
+
+    disk = {}
+    sample = samples.get(dummy.backend, samples['pandas'])
+    binary_columns = [name for name, column_type in dummy.columns_to_display.items() if column_type == 'BYTE']
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in formats:
+            path = os.path.join(directory, 'sample.{}'.format(file_format))
+            try:
+                writers.write_chunks([sample], path, file_format, binary_columns)
+            except ImportError:
+                # Parquet and feather without pyarrow.
+                continue
+            row_bytes = os.path.getsize(path) / sample_rows
+            disk[file_format] = {'row_bytes': row_bytes, 'bytes': round(row_bytes * rows)}
+    return {'rows': rows, 'sample_rows': sample_rows, 'columns': columns, 'memory': memory, 'disk': disk}
+
+
+def estimate(cfg: dict = None, columns_to_display: dict = None, rows: int = None, sample_rows: int = SAMPLE_ROWS,
+             formats: Iterable[str] = writers.FORMATS, **kwargs) -> dict:
+    """
+    Estimate the memory and disk taken by a dataframe before building it.
+
+    Args:
+        cfg (dict): config dictionary. By default, the config file of the package.
+        columns_to_display (dict): output column names and types. By default, the example_columns of the config.
+        rows (int): rows of the whole output. By default, dataframe_rows from the config.
+        sample_rows (int): rows of the sample on which the sizes are measured.
+        formats (Iterable[str]): file formats whose size is estimated.
+        **kwargs: other arguments of DummyDataframe, e.g. engine='numpy' or byte_format='fixed'.
+
+    Returns: dict
+        with the rows, the sample_rows, and:
+            columns: type and generated_row_bytes (see ColumnType.row_bytes) of every output column.
+            memory: for every backend, row_bytes and bytes of the output, and peak_row_bytes and peak_bytes
+                of the memory needed to build it.
+            disk: for every file format, row_bytes and bytes of the output written to a file.
+
+    """
+    from dummydf.dummydf import DummyDataframe
+    return measure(DummyDataframe(yaml_config=cfg, columns_to_display=columns_to_display, **kwargs), rows,
+                   sample_rows, formats)
@@ -0,0 +1,72 @@
+# Serializable state of a DummyDataframe of the numpy engine: everything needed to generate more
+# rows of the same dataset in another process, later on, e.g. to keep growing a table:
+#
+# dummy = DummyDataframe(engine='numpy')
+# first_rows = dummy.append_rows(10 ** 6)
+# with open('state.json', 'w') as state_file:
+#     json.dump(dummy.get_state(), state_file)
+# ...
+# dummy = DummyDataframe.from_state(json.load(open('state.json')))
+# next_rows = dummy.append_rows(10 ** 6)  # same as rows 10 ** 6 to 2 * 10 ** 6 of a single run
+#
+# Every block of rows has its own random stream, so continuing only generates the new rows.
+# The config is stored as JSON, with its dictionaries as lists of pairs, since the rubbish values
+# (NaN, None) cannot be JSON keys, and datetimes as ISO strings.
+
+"""
+State
+"""
+
+from datetime import date, datetime
+import numpy as np
+
+# Version of the state format, checked when restoring.
+STATE_VERSION = 1
+
+
+def encode(value):
+    """
+    JSON compatible version of a config value, see decode.
+
+    Args:
+        value: config value.
+
+    Returns:
+        JSON compatible value.
+
+    """
+    if isinstance(value, dict):
+        return {'__dict__': [[encode(key), encode(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def decode(value):
+    """
+    Config value encoded with encode.
+
+    Args:
+        value: JSON compatible value.
+
+    Returns:
+        config value.
+
+    """
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '__dict__' in value:
+        return {decode(key): decode(item) for key, item in value['__dict__']}
+    if '__datetime__' in value:
+        return datetime.fromisoformat(value['__datetime__'])
+    if '__date__' in value:
+        return date.fromisoformat(value['__date__'])
+    return {key: decode(item) for key, item in value.items()}
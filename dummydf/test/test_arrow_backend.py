@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import pandas as pd
+from numpy import nan
+from dummydf import DummyDataframe
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+try:
+    import pyarrow
+    from dummydf import arrow_backend
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestArrowBackend(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy', backend='arrow')
+
+    def test_missing_rubbish_are_nulls_in_validity_bitmap(self):
+        array = arrow_backend.to_arrow_with_rubbish(np.arange(4, dtype=np.int64), np.array([-1, 0, 1, -1]), [nan, None])
+        self.assertEqual(pyarrow.int64(), array.type)
+        self.assertEqual([0, None, None, 3], array.to_pylist())
+
+    def test_rubbish_strings_are_inserted_in_string_columns_only(self):
+        codes = np.array([0, -1, 1])
+        strings = arrow_backend.to_arrow_with_rubbish(np.array(['ab', 'cd', 'ef']), codes, ['NULL', ' '])
+        self.assertEqual(['NULL', 'cd', ' '], strings.to_pylist())
+        floats = arrow_backend.to_arrow_with_rubbish(np.array([1.5, 2.5, 3.5]), codes, ['NULL', ' '])
+        self.assertEqual([None, 2.5, None], floats.to_pylist())
+
+    def test_table_has_typed_columns_with_display_names(self):
+        schema = self.dummy.table.schema
+        self.assertEqual(list(YAML_CONFIG_DICT['example_columns']), schema.names)
+        self.assertEqual(pyarrow.int64(), schema.field('CACONT_ACC').type)
+        self.assertEqual(pyarrow.float64(), schema.field('BALANCE').type)
+        self.assertEqual(pyarrow.string(), schema.field('EXHAUSTED_REASON').type)
+
+    def test_table_has_the_same_rubbish_cells_as_pandas_backend(self):
+        pandas_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').df
+        for name in pandas_df.columns:
+            rubbish = pandas_df[name].isin(['NULL', 'NONE', 'NaN', ' ']) | pandas_df[name].isna()
+            actual = self.dummy.table.column(name).to_pandas()
+            if pyarrow.types.is_string(self.dummy.table.schema.field(name).type):
+                self.assertTrue((actual[~rubbish] == pandas_df[name][~rubbish]).all())
+            self.assertTrue((actual.isna() | actual.isin(['NULL', 'NONE', 'NaN', ' ']))[rubbish].all())
+
+    def test_chunks_are_tables_equal_to_whole_table(self):
+        self.assertTrue(pyarrow.concat_tables(self.dummy.iter_chunks(20, 6)).equals(self.dummy.table))
+
+    def test_df_is_the_table_converted_to_pandas(self):
+        pd.testing.assert_frame_equal(self.dummy.table.to_pandas(), self.dummy.df)
+
+    def test_arrow_backend_needs_numpy_engine(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT, backend='arrow')
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').table
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf import cache as frame_cache
+from dummydf.cache import FrameCache, frame_key
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestFrameCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_same_arguments_hit_the_cache(self):
+        cache = FrameCache()
+        first_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, cache=cache).df
+        second_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, cache=cache).df
+        assert_frame_equal(DummyDataframe(yaml_config=YAML_CONFIG_DICT).df, second_df)
+        assert_frame_equal(first_df, second_df)
+        self.assertEqual(1, cache.stats['misses'])
+        self.assertEqual(1, cache.stats['hits'])
+
+    def test_different_seed_or_columns_miss(self):
+        cache = FrameCache()
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, cache=cache).df
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, seed=11, cache=cache).df
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, columns_to_display={'AMOUNT': 'FLOAT'}, cache=cache).df
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy', cache=cache).df
+        self.assertEqual(4, cache.stats['misses'])
+        self.assertEqual(0, cache.stats['hits'])
+
+    def test_randomised_without_seed_is_not_cached(self):
+        cache = FrameCache()
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, randomise=True, cache=cache).df
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.stats['misses'])
+
+    def test_key_is_stable_and_sensitive_to_rubbish_order(self):
+        rubbish = {'NULL': 0.1, 'nan': 0.2}
+        key = frame_key(dict(YAML_CONFIG_DICT, rubbish_to_insert=rubbish), 10, {'A': 'FLOAT'})
+        self.assertEqual(key, frame_key(dict(YAML_CONFIG_DICT, rubbish_to_insert=dict(rubbish)), 10, {'A': 'FLOAT'}))
+        reversed_cfg = dict(YAML_CONFIG_DICT, rubbish_to_insert=dict(reversed(list(rubbish.items()))))
+        self.assertNotEqual(key, frame_key(reversed_cfg, 10, {'A': 'FLOAT'}))
+
+    def test_callers_cannot_poison_the_cache(self):
+        cache = FrameCache()
+        df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, cache=cache).df
+        expected_df = df.copy()
+        df.iloc[0, 0] = 'POISON'
+        byte_column = df.columns[[isinstance(value, bytearray) for value in df.iloc[0]]]
+        for name in byte_column:
+            df[name].iloc[0][:] = b'x' * len(df[name].iloc[0])
+        assert_frame_equal(DummyDataframe(yaml_config=YAML_CONFIG_DICT).df,
+                           DummyDataframe(yaml_config=YAML_CONFIG_DICT, cache=cache).df)
+        self.assertFalse(expected_df.equals(df))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = FrameCache(max_entries=1)
+        cache.get_or_build('a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        cache.get_or_build('b', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT, seed=1).df)
+        self.assertEqual(1, cache.stats['evictions'])
+        cache.get_or_build('a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        self.assertEqual(3, cache.stats['misses'])
+
+    def test_miss_makes_one_copy(self):
+        cache = FrameCache()
+        with mock.patch('dummydf.cache.defensive_copy', wraps=frame_cache.defensive_copy) as defensive_copy:
+            cache.get_or_build('a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        self.assertEqual(1, defensive_copy.call_count)
+
+    def test_hits_only_copy_the_bytearray_columns_value_by_value(self):
+        cache = FrameCache()
+        cache.get_or_build('a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        with mock.patch('dummydf.cache.bytearray_columns') as bytearray_columns:
+            df = cache.get_or_build('a', self.fail)
+        bytearray_columns.assert_not_called()
+        self.assertEqual([1], frame_cache.bytearray_columns(df))
+
+    def test_concurrent_accesses_are_all_counted(self):
+        cache = FrameCache()
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda key: cache.get_or_build(key, pd.DataFrame), ['a', 'b'] * 50))
+        self.assertEqual(100, cache.stats['hits'] + cache.stats['misses'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_disk_tier_survives_a_new_cache(self):
+        FrameCache(directory=self.directory.name).get_or_build(
+            'a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        cache = FrameCache(directory=self.directory.name)
+        df = cache.get_or_build('a', self.fail)
+        assert_frame_equal(DummyDataframe(yaml_config=YAML_CONFIG_DICT).df, df)
+        self.assertEqual(1, cache.stats['disk_hits'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_disk_tier_keeps_object_columns_exactly(self):
+        for kwargs in ({}, {'engine': 'numpy'}, {'engine': 'numpy', 'byte_format': 'fixed'}):
+            with self.subTest(**kwargs):
+                expected_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, **kwargs).df
+                FrameCache(directory=self.directory.name).get_or_build(str(kwargs), lambda: expected_df)
+                df = FrameCache(directory=self.directory.name).get_or_build(str(kwargs), self.fail)
+                assert_frame_equal(expected_df, df)
+                self.assertEqual(expected_df.applymap(type).values.tolist(), df.applymap(type).values.tolist())
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_frames_that_cannot_be_stored_stay_in_memory(self):
+        cache = FrameCache(directory=self.directory.name)
+        df = cache.get_or_build('a', lambda: pd.DataFrame({'DATE': [pd.Timestamp('2020-01-01'), 'NULL']}))
+        self.assertEqual([], os.listdir(self.directory.name))
+        assert_frame_equal(df, cache.get_or_build('a', self.fail))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_disk_tier_is_evicted_by_size(self):
+        cache = FrameCache(directory=self.directory.name, max_disk_bytes=1)
+        cache.get_or_build('a', lambda: DummyDataframe(yaml_config=YAML_CONFIG_DICT).df)
+        self.assertEqual([], os.listdir(self.directory.name))
+        self.assertEqual(1, cache.stats['disk_evictions'])
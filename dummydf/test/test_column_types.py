@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf import column_types
+from dummydf.plan import GenerationPlan
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+CATEGORIES = np.array(['LOW', 'MID', 'HIGH'])
+
+
+def random_categories(rng: np.random.Generator, rows: int) -> np.ndarray:
+    return CATEGORIES[rng.integers(0, len(CATEGORIES), size=rows)]
+
+
+class TestColumnTypes(unittest.TestCase):
+
+    def setUp(self) -> None:
+        column_types.register_column_type('CATEGORY', random_categories, '<U4', 16)
+        self.columns = {'LEVEL': 'CATEGORY', 'AMOUNT': 'FLOAT'}
+        # No rubbish, so that the generated dtypes are kept.
+        self.cfg = dict(YAML_CONFIG_DICT, dataframe_rows=50, rubbish_to_insert={})
+
+    def tearDown(self) -> None:
+        column_types.unregister_column_type('CATEGORY')
+
+    def test_registered_type_is_generated_with_its_dtype(self):
+        df = DummyDataframe(yaml_config=self.cfg, columns_to_display=self.columns, engine='numpy').df
+        self.assertEqual(['LEVEL', 'AMOUNT'], list(df.columns))
+        self.assertTrue(df['LEVEL'].isin(CATEGORIES).all())
+        self.assertEqual(np.float64, df['AMOUNT'].dtype)
+
+    def test_registered_type_is_chunk_invariant(self):
+        dummy = DummyDataframe(yaml_config=self.cfg, columns_to_display=self.columns, engine='numpy')
+        assert_frame_equal(dummy.df, pd.concat(dummy.iter_chunks(chunk_size=7)))
+
+    def test_python_engine_generates_registered_type(self):
+        df = DummyDataframe(yaml_config=self.cfg, columns_to_display=self.columns).df
+        self.assertTrue(df['LEVEL'].isin(CATEGORIES).all())
+
+    def test_python_engine_registered_type_does_not_change_the_rubbish_of_other_columns(self):
+        cfg = dict(YAML_CONFIG_DICT, dataframe_rows=50)
+        alone_df = DummyDataframe(yaml_config=cfg, columns_to_display={'ACC': 'ACCOUNT'}).df
+        actual_df = DummyDataframe(yaml_config=cfg, columns_to_display={'ACC': 'ACCOUNT', 'LEVEL': 'CATEGORY'}).df
+        assert_frame_equal(alone_df, actual_df[['ACC']])
+        self.assertTrue(actual_df['LEVEL'].isin(CATEGORIES).any())
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_backend_generates_registered_type(self):
+        table = DummyDataframe(yaml_config=self.cfg, columns_to_display=self.columns, engine='numpy',
+                               backend='arrow').table
+        self.assertEqual(pyarrow.string(), table.schema.field('LEVEL').type)
+
+    def test_plan_generates_the_declared_dtype_into_out(self):
+        registered = column_types.get_column_type('HEX')
+        plan = GenerationPlan(self.cfg, {'GUID_HEX': 'HEX'})
+        values = plan.generate('HEX', 10, 0, 3, 9000)
+        self.assertEqual(registered.dtype(self.cfg), values.dtype)
+        self.assertEqual(8997, len(values))
+        self.assertEqual(4 * self.cfg['hex_number_length'], registered.row_bytes(self.cfg))
+        out = np.empty(8997, dtype=values.dtype)
+        self.assertIs(out, plan.generate('HEX', 10, 0, 3, 9000, out=out))
+        np.testing.assert_array_equal(values, out)
+
+    def test_unknown_or_duplicated_type_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=self.cfg, columns_to_display={'A': 'DECIMAL'})
+        with self.assertRaises(ValueError):
+            column_types.register_column_type('CATEGORY', random_categories, '<U4', 16)
@@ -1,9 +1,17 @@
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
 import unittest
 from datetime import datetime as dt
+import numpy as np
 import pandas as pd
 from numpy import nan
 from pandas.testing import assert_frame_equal
 from dummydf import DummyDataframe
+from dummydf.vectorized import BLOCK_ROWS
 
 # Sample config to avoid dependencies on external config files for unit testing
 YAML_CONFIG_DICT = {
@@ -202,6 +210,33 @@ class TestInsertRubbishIntoDataframe(unittest.TestCase):
         actual_df = self.dummy.insert_rubbish_to_df(self.df_to_use)
         assert_frame_equal(expected_df, actual_df)
 
+    def test_untouched_columns_keep_their_dtype(self):
+        df = pd.DataFrame({'COLUMNA1': [1, 2, 3], 'COLUMNA2': [1.5, 2.5, 3.5]})
+        self.dummy.cfg = dict(self.dummy.cfg, rubbish_to_insert={'NULL': 0})
+        assert_frame_equal(df, self.dummy.insert_rubbish_to_df(df))
+
+    def test_missing_values_keep_numeric_columns_numeric(self):
+        df = pd.DataFrame({'COLUMNA1': range(100), 'COLUMNA2': [1.5] * 100})
+        self.dummy.cfg = dict(self.dummy.cfg, rubbish_to_insert={nan: 0.2, None: 0.2})
+        actual_df = self.dummy.insert_rubbish_to_df(df)
+        self.assertEqual(['float64', 'float64'], list(actual_df.dtypes.astype(str)))
+        self.assertTrue(actual_df.isna().any().all())
+
+    def test_missing_values_use_nullable_dtypes_if_asked(self):
+        df = pd.DataFrame({'COLUMNA1': range(100), 'COLUMNA2': [1.5] * 100})
+        dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, rubbish_to_insert={nan: 0.2, None: 0.2}),
+                               nullable_dtypes=True)
+        actual_df = dummy.insert_rubbish_to_df(df)
+        self.assertEqual(['Int64', 'Float64'], list(actual_df.dtypes.astype(str)))
+        self.assertTrue(actual_df.isna().any().all())
+
+    def test_every_rubbish_value_is_inserted_if_randomised(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, randomise=True)
+        df = pd.DataFrame({'COLUMNA1': ['VALOR'] * 2000})
+        inserted = dummy.insert_rubbish_to_df(df)['COLUMNA1']
+        self.assertEqual({'NULL', 'NONE', 'NaN', ' '}, set(inserted[inserted.notna()]) - {'VALOR'})
+        self.assertTrue(inserted.map(lambda value: value is None).any())
+
     def test_columns_to_display_selected_correctly(self):
         self.dummy.columns_to_display = {'COL1': 'COLUMNA1', 'COL2': 'COLUMNA2'}
         expected_df = pd.DataFrame(
@@ -227,5 +262,252 @@ class TestInsertRubbishIntoDataframe(unittest.TestCase):
         assert_frame_equal(expected_df, actual_df)
 
 
+class TestSeed(unittest.TestCase):
+
+    def test_global_random_state_is_not_touched(self):
+        random.seed(123)
+        np.random.seed(123)
+        expected = (random.random(), np.random.random())
+        random.seed(123)
+        np.random.seed(123)
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT).df
+        DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').df
+        self.assertEqual(expected, (random.random(), np.random.random()))
+
+    def test_same_seed_gives_same_dataframe(self):
+        for engine in DummyDataframe.ENGINES:
+            with self.subTest(engine=engine):
+                first_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine=engine, randomise=True, seed=5).df
+                second_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine=engine, randomise=True, seed=5).df
+                assert_frame_equal(first_df, second_df)
+
+    def test_different_seeds_give_different_dataframes(self):
+        first_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, seed=5).df
+        second_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, seed=6).df
+        with self.assertRaises(AssertionError):
+            assert_frame_equal(first_df, second_df)
+
+    def test_build_many_matches_sequential_builds(self):
+        arguments = [{'yaml_config': YAML_CONFIG_DICT, 'engine': engine, 'seed': seed}
+                     for engine in DummyDataframe.ENGINES for seed in range(4)]
+        expected_dfs = [DummyDataframe(**kwargs).df for kwargs in arguments]
+        for expected_df, actual_df in zip(expected_dfs, DummyDataframe.build_many(arguments, max_workers=4)):
+            assert_frame_equal(expected_df, actual_df)
+
+
+class TestColumnsToDisplay(unittest.TestCase):
+
+    def test_only_requested_types_are_created(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, columns_to_display={'ACC': 'ACCOUNT', 'BAL': 'FLOAT'})
+        self.assertEqual(['FLOAT', 'ACCOUNT'], list(dummy.create_dataframe().columns))
+
+    def test_python_engine_columns_do_not_depend_on_other_columns(self):
+        full_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT).df
+        actual_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT,
+                                   columns_to_display={'BALANCE': 'FLOAT', 'CACONT_ACC': 'ACCOUNT'}).df
+        assert_frame_equal(full_df[['BALANCE', 'CACONT_ACC']], actual_df)
+
+    def test_seeded_python_engine_columns_do_not_depend_on_other_columns(self):
+        full_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, randomise=True, seed=5).df
+        actual_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, randomise=True, seed=5,
+                                   columns_to_display={'BALANCE': 'FLOAT', 'CACONT_ACC': 'ACCOUNT'}).df
+        assert_frame_equal(full_df[['BALANCE', 'CACONT_ACC']], actual_df)
+
+    def test_randomised_python_engine_generates_type_requested_twice_independently(self):
+        df = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=200), randomise=True,
+                            columns_to_display={'FIRST': 'STRING', 'SECOND': 'STRING'}).df
+        self.assertEqual(['FIRST', 'SECOND'], list(df.columns))
+        # The rubbish values are never 30 characters long.
+        generated = df.applymap(lambda value: isinstance(value, str) and len(value) == 30)
+        self.assertFalse(generated['FIRST'].equals(generated['SECOND']))
+        both_generated = generated.all(axis=1)
+        self.assertFalse((df['FIRST'] == df['SECOND'])[both_generated].any())
+
+    def test_numpy_engine_columns_do_not_depend_on_other_columns(self):
+        full_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').df
+        actual_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy',
+                                   columns_to_display={'BALANCE': 'FLOAT', 'GUID_HEX': 'HEX'}).df
+        assert_frame_equal(full_df[['BALANCE', 'GUID_HEX']], actual_df)
+
+    def test_numpy_engine_generates_type_requested_twice_independently(self):
+        df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy',
+                            columns_to_display={'FIRST': 'STRING', 'SECOND': 'STRING'}).df
+        self.assertFalse((df['FIRST'] == df['SECOND']).any())
+
+
+class TestChunks(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=BLOCK_ROWS + 50), engine='numpy')
+
+    def test_concatenated_chunks_equal_whole_dataframe_for_any_chunk_size(self):
+        for chunk_size in (1000, BLOCK_ROWS, BLOCK_ROWS + 1, 3 * BLOCK_ROWS):
+            with self.subTest(chunk_size=chunk_size):
+                actual_df = pd.concat(self.dummy.iter_chunks(BLOCK_ROWS + 50, chunk_size))
+                assert_frame_equal(self.dummy.df, actual_df)
+
+    def test_chunks_have_at_most_chunk_size_rows(self):
+        lengths = [len(chunk) for chunk in self.dummy.iter_chunks(2500, 1000)]
+        self.assertEqual([1000, 1000, 500], lengths)
+
+    def test_randomised_chunks_come_from_the_same_dataframe(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy', randomise=True)
+        assert_frame_equal(dummy.df, pd.concat(dummy.iter_chunks(20, 7)))
+
+    def test_iter_chunks_raises_value_error_with_python_engine(self):
+        with self.assertRaises(ValueError):
+            next(DummyDataframe(yaml_config=YAML_CONFIG_DICT).iter_chunks(20, 5))
+
+
+class TestAsyncChunks(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=100), engine='numpy')
+        self.generated = []
+        generate_rows = self.dummy.generate_rows
+        self.dummy.generate_rows = lambda start, stop: self.generated.append(start) or generate_rows(start, stop)
+
+    def collect(self, **kwargs) -> list:
+        async def consume() -> list:
+            return [chunk async for chunk in self.dummy.agenerate(**kwargs)]
+        return asyncio.run(consume())
+
+    def test_async_chunks_equal_iter_chunks(self):
+        assert_frame_equal(pd.concat(self.dummy.iter_chunks(100, 30)), pd.concat(self.collect(chunk_size=30)))
+
+    def test_generation_waits_for_a_slow_consumer(self):
+        async def consume_slowly() -> list:
+            ahead = []
+            async for _ in self.dummy.agenerate(chunk_size=5, prefetch=2):
+                await asyncio.sleep(0.01)
+                ahead.append(len(self.generated))
+            return ahead
+        ahead = asyncio.run(consume_slowly())
+        # Chunks generated after consuming k of them: at most prefetch queued and one being put.
+        self.assertTrue(all(generated <= consumed + 3 for consumed, generated in enumerate(ahead, 1)))
+
+    def test_leaving_the_loop_stops_the_generation(self):
+        async def consume_two() -> None:
+            chunks = self.dummy.agenerate(chunk_size=1, prefetch=1)
+            async for _ in chunks:
+                if len(self.generated) >= 2:
+                    break
+            await chunks.aclose()
+            await asyncio.sleep(0.05)
+        asyncio.run(consume_two())
+        self.assertLess(len(self.generated), 5)
+
+    def test_generation_errors_reach_the_consumer(self):
+        self.dummy.generate_rows = lambda start, stop: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            self.collect()
+
+    def test_agenerate_raises_value_error_with_python_engine(self):
+        self.dummy.engine = 'python'
+        with self.assertRaises(ValueError):
+            self.collect()
+
+
+class TestAppendRows(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=BLOCK_ROWS + 50), engine='numpy')
+
+    def test_appended_rows_continue_the_dataframe(self):
+        chunks = [self.dummy.append_rows(rows) for rows in (10, BLOCK_ROWS, 40)]
+        assert_frame_equal(self.dummy.df, pd.concat(chunks))
+        self.assertEqual(BLOCK_ROWS + 50, self.dummy.rows_generated)
+
+    def test_restored_state_continues_the_dataset(self):
+        self.dummy.append_rows(BLOCK_ROWS)
+        saved_state = json.loads(json.dumps(self.dummy.get_state()))
+        restored = DummyDataframe.from_state(saved_state)
+        assert_frame_equal(self.dummy.df.iloc[BLOCK_ROWS:], restored.append_rows(50))
+
+    def test_randomised_state_keeps_its_seed(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy', randomise=True)
+        dummy.append_rows(5)
+        restored = DummyDataframe.from_state(json.loads(json.dumps(dummy.get_state())))
+        assert_frame_equal(dummy.df.iloc[5:], restored.append_rows(15))
+
+    def test_state_raises_value_error_with_python_engine_or_unknown_version(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT).get_state()
+        with self.assertRaises(ValueError):
+            DummyDataframe.from_state(dict(self.dummy.get_state(), version=0))
+
+
+class TestWorkers(unittest.TestCase):
+
+    def test_dataframe_is_the_same_for_any_number_of_workers(self):
+        config = dict(YAML_CONFIG_DICT, dataframe_rows=2 * BLOCK_ROWS + 10)
+        expected_df = DummyDataframe(yaml_config=config, engine='numpy').df
+        for workers in (2, 3):
+            with self.subTest(workers=workers):
+                actual_df = DummyDataframe(yaml_config=config, engine='numpy', workers=workers).df
+                assert_frame_equal(expected_df, actual_df)
+
+    def test_chunks_generated_by_workers_equal_whole_dataframe(self):
+        dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=BLOCK_ROWS + 10),
+                               engine='numpy', workers=2)
+        assert_frame_equal(dummy.df, pd.concat(dummy.iter_chunks(BLOCK_ROWS + 10, BLOCK_ROWS + 5)))
+
+    def test_workers_raise_value_error_with_python_engine(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT, workers=2)
+
+
+class TestImport(unittest.TestCase):
+
+    def run_python(self, code: str) -> str:
+        environment = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        return subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True,
+                              env=environment, check=True).stdout
+
+    def test_import_is_silent_and_does_not_import_pandas(self):
+        output = self.run_python("import sys, dummydf; print('pandas' in sys.modules, 'yaml' in sys.modules)")
+        self.assertEqual('False False\n', output)
+
+    def test_example_dataframes_are_built_on_first_access(self):
+        output = self.run_python('import dummydf; print(len(dummydf.test_df), len(dummydf.test_df_random))')
+        self.assertEqual('20 20\n', output)
+
+    def test_unknown_attribute_raises_attribute_error(self):
+        import dummydf
+        with self.assertRaises(AttributeError):
+            dummydf.not_an_attribute
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_report_records_every_stage(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, instrument=True)
+        dummy.df
+        stages = [record['stage'] for record in dummy.report]
+        self.assertIn('generate_list_with_random_datetimes', stages)
+        self.assertIn('insert_rubbish_to_df', stages)
+        self.assertEqual('build_dataframe', stages[-1])
+        self.assertEqual(0, dummy.report[-1]['depth'])
+        self.assertEqual(20, dummy.report[-1]['rows'])
+        self.assertGreater(dummy.report[-1]['peak_bytes'], 0)
+
+    def test_numpy_engine_records_each_column_type(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy', instrument=True)
+        dummy.df
+        self.assertIn('generate_column:DATETIME', [record['stage'] for record in dummy.report])
+
+    def test_callback_and_logger_receive_the_records(self):
+        records = []
+        with self.assertLogs('dummydf', level='DEBUG') as logs:
+            DummyDataframe(instrument=records.append).df
+        self.assertEqual('fetch_yaml_config', records[0]['stage'])
+        self.assertEqual(len(records), len(logs.records))
+
+    def test_instrumentation_does_not_change_the_dataframe(self):
+        assert_frame_equal(DummyDataframe(yaml_config=YAML_CONFIG_DICT).df,
+                           DummyDataframe(yaml_config=YAML_CONFIG_DICT, instrument=True).df)
+        self.assertEqual([], DummyDataframe(yaml_config=YAML_CONFIG_DICT).report)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime as dt
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf.plan import GenerationPlan, load_yaml_config
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+
+class TestGenerationPlan(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.columns = {'ACCOUNT_ID': 'ACCOUNT', 'BALANCE': 'FLOAT', 'CALL_DATE': 'DATETIME'}
+        self.plan = GenerationPlan(YAML_CONFIG_DICT, self.columns)
+
+    def test_plan_gives_the_same_dataframe_as_the_config(self):
+        for engine in DummyDataframe.ENGINES:
+            expected_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, columns_to_display=self.columns,
+                                         randomise=True, seed=3, engine=engine).df
+            actual_df = DummyDataframe(plan=self.plan, randomise=True, seed=3, engine=engine).df
+            assert_frame_equal(expected_df, actual_df)
+
+    def test_plan_is_shared_across_threads(self):
+        expected_dfs = [DummyDataframe(plan=self.plan, randomise=True, seed=seed, engine='numpy').df
+                        for seed in range(8)]
+        actual_dfs = DummyDataframe.build_many(
+            [{'plan': self.plan, 'randomise': True, 'seed': seed, 'engine': 'numpy'} for seed in range(8)],
+            max_workers=4)
+        for expected_df, actual_df in zip(expected_dfs, actual_dfs):
+            assert_frame_equal(expected_df, actual_df)
+
+    def test_plan_is_compiled_again_when_the_columns_change(self):
+        dummy = DummyDataframe(plan=self.plan, engine='numpy')
+        dummy.columns_to_display = {'BALANCE': 'FLOAT'}
+        self.assertEqual(['BALANCE'], list(dummy.df.columns))
+        self.assertIsNot(self.plan, dummy.plan)
+
+    def test_invalid_config_raises_value_error(self):
+        config_without_strings = {key: value for key, value in YAML_CONFIG_DICT.items() if key != 'length_strings'}
+        with self.assertRaises(ValueError):
+            GenerationPlan(config_without_strings, {'NAME': 'STRING'})
+        with self.assertRaises(ValueError):
+            GenerationPlan(dict(YAML_CONFIG_DICT, rubbish_to_insert={None: 1.5}), self.columns)
+        with self.assertRaises(ValueError):
+            DummyDataframe(plan=self.plan, yaml_config=YAML_CONFIG_DICT)
+
+    def test_yaml_file_is_parsed_once_and_copied(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'config.yml')
+            with open(path, 'w') as yaml_file:
+                yaml_file.write('dataframe_rows: 5\nrubbish_to_insert: {}\nexample_columns: {BALANCE: FLOAT}\n')
+            cfg = load_yaml_config(path)
+            cfg['dataframe_rows'] = 10
+            self.assertEqual(5, load_yaml_config(path)['dataframe_rows'])
+            self.assertEqual(5, GenerationPlan.from_yaml(path).cfg['dataframe_rows'])
+
+    def test_config_modified_in_place_is_compiled_again(self):
+        for engine in DummyDataframe.ENGINES:
+            with self.subTest(engine=engine):
+                dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT), randomise=True, engine=engine,
+                                       columns_to_display={'NAME': 'STRING', 'CALL_DATE': 'DATETIME'})
+                self.assertEqual(20, len(dummy.df))
+                dummy.cfg['length_strings'] = 5
+                dummy.cfg['datetime_start'] = dt(year=2030, month=1, day=1)
+                dummy.df = None
+                names = dummy.df['NAME'][dummy.df['NAME'].str.len() > 4]
+                self.assertEqual({5}, set(names.str.len()))
+                dates = pd.to_datetime(dummy.df['CALL_DATE'], format='%d.%m.%Y %H:%M:%S', errors='coerce')
+                self.assertTrue((dates.dropna() >= dt(year=2030, month=1, day=1)).all())
+
+    def test_instances_sharing_a_plan_do_not_share_their_config(self):
+        plan = GenerationPlan(dict(YAML_CONFIG_DICT), {'NAME': 'STRING'})
+        first = DummyDataframe(plan=plan, engine='numpy', seed=1)
+        second = DummyDataframe(plan=plan, engine='numpy', seed=2)
+        first.cfg['length_strings'] = 5
+        first.columns_to_display['OTHER'] = 'FLOAT'
+        self.assertEqual(30, plan.cfg['length_strings'])
+        self.assertEqual({'NAME': 'STRING'}, plan.columns_to_display)
+        names = second.df['NAME'][second.df['NAME'].str.len() > 4]
+        self.assertEqual({30}, set(names.str.len()))
+        self.assertIs(plan, second.plan)
+        self.assertEqual(['NAME', 'OTHER'], list(first.df.columns))
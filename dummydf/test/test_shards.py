@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf import shards
+from dummydf.__main__ import main
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+from dummydf.vectorized import BLOCK_ROWS
+
+
+class TestShards(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.dummy = DummyDataframe(yaml_config=dict(YAML_CONFIG_DICT, dataframe_rows=3 * BLOCK_ROWS + 20),
+                                    engine='numpy', randomise=True)
+        self.manifest = json.loads(json.dumps(shards.make_manifest(self.dummy, shards=3)))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_shards_put_together_equal_the_whole_dataframe(self):
+        self.assertEqual(3, len(self.manifest['shards']))
+        actual_df = pd.concat(shards.generate_shard(self.manifest, index) for index in range(3))
+        assert_frame_equal(self.dummy.df, actual_df)
+
+    def test_shards_are_contiguous_and_cut_at_block_boundaries(self):
+        stops = [shard['stop'] for shard in self.manifest['shards']]
+        starts = [shard['start'] for shard in self.manifest['shards']]
+        self.assertEqual([0] + stops[:-1], starts)
+        self.assertEqual(3 * BLOCK_ROWS + 20, stops[-1])
+        self.assertTrue(all(start % BLOCK_ROWS == 0 for start in starts))
+
+    def test_iter_chunks_from_a_first_row(self):
+        chunks = self.dummy.iter_chunks(BLOCK_ROWS + 30, chunk_size=7, first_row=BLOCK_ROWS - 5)
+        assert_frame_equal(self.dummy.df.iloc[BLOCK_ROWS - 5:BLOCK_ROWS + 30], pd.concat(chunks))
+
+    def test_command_line_writes_a_shard(self):
+        manifest_path = os.path.join(self.directory.name, 'manifest.json')
+        with open(manifest_path, 'w') as manifest_file:
+            json.dump(self.manifest, manifest_file)
+        paths = [os.path.join(self.directory.name, 'shard_{}.csv'.format(index)) for index in range(3)]
+        for index, path in enumerate(paths):
+            main([path, '--manifest', manifest_path, '--shard', str(index), '--chunk-size', '1000'])
+        whole_path = os.path.join(self.directory.name, 'whole.csv')
+        self.dummy.write_to(whole_path)
+        # Read as text: the dtypes inferred for every file depend on where the rubbish landed.
+        expected_df = pd.read_csv(whole_path, keep_default_na=False, dtype=str)
+        actual_df = pd.concat([pd.read_csv(path, keep_default_na=False, dtype=str) for path in paths],
+                              ignore_index=True)
+        assert_frame_equal(expected_df, actual_df)
+
+    def test_unknown_shard_or_version_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            shards.generate_shard(self.manifest, 3)
+        with self.assertRaises(ValueError):
+            shards.generate_shard(dict(self.manifest, version=0), 0)
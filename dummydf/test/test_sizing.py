@@ -0,0 +1,45 @@
+import unittest
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf import sizing
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+from dummydf.vectorized import BLOCK_ROWS
+
+
+class TestSizing(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cfg = dict(YAML_CONFIG_DICT, dataframe_rows=12000)
+
+    def test_estimate_is_close_to_the_built_dataframe(self):
+        for engine in DummyDataframe.ENGINES:
+            with self.subTest(engine=engine):
+                sizes = sizing.estimate(self.cfg, engine=engine, randomise=True, seed=1, sample_rows=1000)
+                df = DummyDataframe(yaml_config=self.cfg, engine=engine, randomise=True, seed=1).df
+                actual_bytes = df.memory_usage(deep=True, index=False).sum()
+                self.assertAlmostEqual(1, sizes['memory']['pandas']['bytes'] / actual_bytes, delta=0.1)
+                self.assertGreater(sizes['memory']['pandas']['peak_bytes'], sizes['memory']['pandas']['bytes'])
+                self.assertEqual(12000, sizes['rows'])
+
+    def test_estimate_reports_columns_and_formats(self):
+        sizes = sizing.estimate(self.cfg, {'BALANCE': 'FLOAT'}, rows=10 ** 9, engine='numpy', formats=('csv',))
+        self.assertEqual({'BALANCE': {'type': 'FLOAT', 'generated_row_bytes': 8}}, sizes['columns'])
+        self.assertEqual(['csv'], list(sizes['disk']))
+        self.assertEqual(round(sizes['disk']['csv']['row_bytes'] * 10 ** 9), sizes['disk']['csv']['bytes'])
+
+    def test_memory_budget_sizes_whole_block_chunks(self):
+        dummy = DummyDataframe(yaml_config=dict(self.cfg, dataframe_rows=3 * BLOCK_ROWS), engine='numpy',
+                               memory_budget=3 * 10 ** 7)
+        chunk_size = dummy.budget_chunk_size()
+        self.assertEqual(0, chunk_size % BLOCK_ROWS)
+        self.assertLess(chunk_size, 3 * BLOCK_ROWS)
+        assert_frame_equal(dummy.df, pd.concat(dummy.iter_chunks()))
+        self.assertEqual(100, dummy.budget_chunk_size(100))
+        self.assertEqual(DummyDataframe.CHUNK_SIZE, DummyDataframe(engine='numpy').budget_chunk_size())
+
+    def test_too_small_memory_budget_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            next(DummyDataframe(yaml_config=self.cfg, engine='numpy', memory_budget=10).iter_chunks())
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=self.cfg, memory_budget=10 ** 9)
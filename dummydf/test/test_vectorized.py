@@ -0,0 +1,207 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime as dt
+import numpy as np
+from numpy import nan
+import pandas as pd
+from pandas.testing import assert_frame_equal
+from dummydf import DummyDataframe
+from dummydf import vectorized
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestVectorizedGenerators(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rng = np.random.default_rng(10)
+
+    def test_strings_have_configured_length_and_characters(self):
+        strings = vectorized.random_strings(self.rng, 50, 30)
+        self.assertEqual(50, len(strings))
+        self.assertTrue(all(len(value) == 30 for value in strings))
+        self.assertTrue(set(''.join(strings)) <= set(vectorized.CHARACTERS_TO_CHOOSE_FROM))
+
+    def test_bytes_are_bytearrays_of_configured_length(self):
+        values = vectorized.random_bytes(self.rng, 50, 15)
+        self.assertTrue(all(isinstance(value, bytearray) and len(value) == 15 for value in values))
+
+    def test_fixed_bytes_hold_the_same_values_as_bytearrays(self):
+        fixed = vectorized.random_fixed_bytes(np.random.default_rng(3), 50, 15)
+        self.assertEqual('S15', fixed.dtype.str[1:])
+        self.assertEqual(vectorized.random_bytes(np.random.default_rng(3), 50, 15),
+                         [bytearray(fixed[row:row + 1].tobytes()) for row in range(50)])
+
+    def test_hexadecimal_digits_are_uppercase_hex(self):
+        values = vectorized.random_hexadecimal_digits(self.rng, 50, 15)
+        self.assertTrue(all(len(value) == 15 for value in values))
+        self.assertTrue(set(''.join(values)) <= set(vectorized.HEXDIGITS))
+
+    def test_accounts_within_bounds(self):
+        values = vectorized.random_accounts(self.rng, 1000)
+        self.assertEqual(np.int64, values.dtype)
+        self.assertTrue(((values >= vectorized.ACCOUNT_LOW) & (values < vectorized.ACCOUNT_HIGH)).all())
+
+    def test_datetimes_within_range_and_formatted(self):
+        values = vectorized.random_datetimes(self.rng, 100, dt(2020, 1, 1), dt(2030, 12, 31))
+        parsed = pd.to_datetime(pd.Series(values), format='%d.%m.%Y %H:%M:%S')
+        self.assertTrue((parsed >= dt(2020, 1, 1)).all())
+        self.assertTrue((parsed < dt(2031, 1, 1)).all())
+
+    def test_datetimes_cover_the_range_to_the_second(self):
+        values = vectorized.random_datetimes(self.rng, 10000, dt(2020, 1, 1), dt(2020, 1, 1, 0, 0, 9),
+                                             output='datetime64')
+        self.assertEqual(np.dtype('M8[ns]'), values.dtype)
+        self.assertEqual(10, len(np.unique(values)))
+        self.assertGreater(len(np.unique(vectorized.random_datetimes(self.rng, 100, dt(2020, 1, 1), dt(2030, 1, 1)))),
+                           95)
+
+    def test_bulk_format_matches_strftime(self):
+        values = vectorized.random_datetimes(self.rng, 1000, dt(1990, 1, 1), dt(2030, 12, 31), output='datetime64')
+        for datetime_format in ['%d.%m.%Y %H:%M:%S', '%Y-%m-%dT%H:%M:%S.%f', '%j/%y %%', 'día %d', '%a %d']:
+            with self.subTest(datetime_format=datetime_format):
+                self.assertEqual(pd.DatetimeIndex(values).strftime(datetime_format).tolist(),
+                                 list(vectorized.format_datetimes(values, datetime_format)))
+
+    def test_zero_width_values_are_empty_strings(self):
+        self.assertEqual([''] * 5, vectorized.random_strings(self.rng, 5, 0).tolist())
+        self.assertEqual([''] * 5, vectorized.random_hexadecimal_digits(self.rng, 5, 0).tolist())
+        self.assertEqual([bytearray()] * 5, vectorized.random_bytes(self.rng, 5, 0))
+        values = np.array(['2020-01-01T10:00:00'] * 5, dtype='M8[s]')
+        self.assertEqual([''] * 5, vectorized.format_datetimes(values, '').tolist())
+
+    def test_unique_permutation_is_a_bijection(self):
+        keys = np.random.SeedSequence(3).generate_state(8, dtype=np.uint64)
+        for size in (1, 10, 16, 1000):
+            with self.subTest(size=size):
+                self.assertEqual(list(range(size)), sorted(vectorized.unique_permutation(keys, 0, size, size)))
+        with self.assertRaises(ValueError):
+            vectorized.unique_permutation(keys, 0, 11, 10)
+
+    def test_unique_accounts_and_hexadecimal_digits_are_distinct(self):
+        keys = np.random.SeedSequence(3).generate_state(8, dtype=np.uint64)
+        accounts = vectorized.unique_accounts(keys, 0, 100000)
+        self.assertEqual(100000, len(np.unique(accounts)))
+        self.assertTrue(((accounts >= vectorized.ACCOUNT_LOW) & (accounts < vectorized.ACCOUNT_HIGH)).all())
+        values = vectorized.unique_hexadecimal_digits(keys, 0, 100000, 15)
+        self.assertEqual(100000, len(np.unique(values)))
+        self.assertTrue(set(''.join(values[:100])) <= set(vectorized.HEXDIGITS))
+
+    def test_rubbish_codes_follow_cumulative_probabilities(self):
+        codes = vectorized.rubbish_codes(np.array([0.05, 0.15, 0.25, 0.95]), np.array([0.1, 0.2]))
+        self.assertEqual([0, 1, 1, -1], codes.tolist())
+
+    def test_rubbish_codes_do_not_wrap_past_127_values(self):
+        codes = vectorized.rubbish_codes(np.array([0.0, 0.994, 0.999]), np.full(200, 1 / 201))
+        self.assertEqual([0, 199, -1], codes.tolist())
+        self.assertEqual(np.int8, vectorized.rubbish_code_dtype(127))
+        self.assertEqual(np.int16, vectorized.rubbish_code_dtype(128))
+
+    def test_blocks_are_the_same_from_any_thread_and_range(self):
+        whole = vectorized.generate_range(vectorized.random_floats, 3, 7, 0, 3 * vectorized.BLOCK_ROWS)
+        starts = range(0, 3 * vectorized.BLOCK_ROWS, 1000)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            parts = list(pool.map(lambda start: vectorized.generate_range(
+                vectorized.random_floats, 3, 7, start, min(start + 1000, 3 * vectorized.BLOCK_ROWS)), starts))
+        np.testing.assert_array_equal(whole, np.concatenate(parts))
+        other_stream = vectorized.generate_range(vectorized.random_floats, 3, 8, 0, vectorized.BLOCK_ROWS)
+        self.assertFalse(np.isin(whole[vectorized.BLOCK_ROWS:], whole[:vectorized.BLOCK_ROWS]).any())
+        self.assertFalse(np.isin(other_stream, whole).any())
+
+    def test_split_range_cuts_at_block_boundaries(self):
+        ranges = vectorized.split_range(100, 5 * vectorized.BLOCK_ROWS + 7, 3)
+        self.assertEqual(3, len(ranges))
+        self.assertEqual(100, ranges[0][0])
+        self.assertEqual(5 * vectorized.BLOCK_ROWS + 7, ranges[-1][1])
+        for (_, stop), (start, _) in zip(ranges[:-1], ranges[1:]):
+            self.assertEqual(stop, start)
+            self.assertEqual(0, start % vectorized.BLOCK_ROWS)
+
+    def test_split_range_never_splits_a_block(self):
+        self.assertEqual([(10, 50)], vectorized.split_range(10, 50, 4))
+
+
+class TestNumpyEngine(unittest.TestCase):
+
+    def test_datetime64_output_keeps_its_dtype_with_missing_rubbish(self):
+        cfg = dict(YAML_CONFIG_DICT, datetime_output='datetime64', rubbish_to_insert={nan: 0.5})
+        df = DummyDataframe(yaml_config=cfg, columns_to_display={'DATE': 'DATETIME'}, engine='numpy').df
+        self.assertEqual(np.dtype('M8[ns]'), df['DATE'].dtype)
+        self.assertTrue(df['DATE'].isna().any())
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=cfg)
+
+    def test_datetime_format_is_configurable(self):
+        cfg = dict(YAML_CONFIG_DICT, datetime_format='%Y-%m-%d %H:%M:%S', rubbish_to_insert={})
+        for engine in DummyDataframe.ENGINES:
+            df = DummyDataframe(yaml_config=cfg, columns_to_display={'DATE': 'DATETIME'}, engine=engine).df
+            pd.to_datetime(df['DATE'], format='%Y-%m-%d %H:%M:%S')
+
+    def test_zero_width_columns_match_the_python_engine(self):
+        cfg = dict(YAML_CONFIG_DICT, dataframe_rows=50, length_strings=0, datetime_format='', rubbish_to_insert={})
+        columns = {'NAME': 'STRING', 'DATE': 'DATETIME'}
+        for engine in DummyDataframe.ENGINES:
+            df = DummyDataframe(yaml_config=cfg, columns_to_display=columns, engine=engine).df
+            self.assertEqual([''] * 50, df['NAME'].tolist())
+            self.assertEqual([''] * 50, df['DATE'].tolist())
+
+    def test_unique_columns_are_distinct_across_chunks(self):
+        cfg = dict(YAML_CONFIG_DICT, dataframe_rows=3 * vectorized.BLOCK_ROWS, rubbish_to_insert={})
+        columns = {'ACCOUNT_A': 'ACCOUNT', 'ACCOUNT_B': 'ACCOUNT', 'GUID': 'HEX'}
+        dummy = DummyDataframe(yaml_config=cfg, columns_to_display=columns, engine='numpy', unique=True)
+        df = pd.concat(dummy.iter_chunks(chunk_size=1000))
+        assert_frame_equal(dummy.df, df)
+        for column in columns:
+            self.assertTrue(df[column].is_unique)
+        self.assertFalse((df['ACCOUNT_A'] == df['ACCOUNT_B']).all())
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=cfg, unique=True)
+
+    def test_unknown_engine_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='fortran')
+
+    def test_numpy_engine_keeps_column_types(self):
+        python_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT).create_dataframe()
+        numpy_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').create_dataframe()
+        self.assertEqual(list(python_df.columns), list(numpy_df.columns))
+        self.assertTrue((python_df.dtypes == numpy_df.dtypes).all())
+        for column in python_df.columns:
+            self.assertEqual(type(python_df[column][0]), type(numpy_df[column][0]))
+
+    def test_numpy_engine_dtypes_only_depend_on_config(self):
+        config = dict(YAML_CONFIG_DICT, rubbish_to_insert={nan: 0.05})
+        df = DummyDataframe(yaml_config=config, engine='numpy',
+                            columns_to_display={'A': 'ACCOUNT', 'F': 'FLOAT', 'I': 'INTEGER'}).df
+        self.assertTrue((df.dtypes == np.float64).all())
+        df = DummyDataframe(yaml_config=config, engine='numpy', nullable_dtypes=True,
+                            columns_to_display={'A': 'ACCOUNT', 'F': 'FLOAT', 'I': 'INTEGER'}).df
+        self.assertEqual(['Int64', 'Float64', 'Int64'], list(df.dtypes.astype(str)))
+
+    def test_byte_format_needs_numpy_engine(self):
+        with self.assertRaises(ValueError):
+            DummyDataframe(yaml_config=YAML_CONFIG_DICT, byte_format='fixed')
+
+    @unittest.skipIf(pyarrow is None or not hasattr(pd.arrays, 'ArrowExtensionArray'), 'needs pyarrow, pandas >= 1.5')
+    def test_fixed_and_memmap_bytes_are_stored_without_objects(self):
+        config = dict(YAML_CONFIG_DICT, rubbish_to_insert={nan: 0.1})
+        for byte_format in ('fixed', 'memmap'):
+            with self.subTest(byte_format=byte_format):
+                dummy = DummyDataframe(yaml_config=config, engine='numpy', byte_format=byte_format,
+                                       columns_to_display={'GUID': 'BYTE'})
+                self.assertEqual(pd.ArrowDtype(pyarrow.binary(15)), dummy.df['GUID'].dtype)
+                self.assertLess(dummy.df['GUID'].memory_usage(deep=True, index=False), 20 * 16)
+                assert_frame_equal(dummy.df, pd.concat(dummy.iter_chunks(20, 6)))
+
+    def test_numpy_engine_is_deterministic_if_not_randomised(self):
+        first_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').df
+        second_df = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy').df
+        assert_frame_equal(first_df, second_df)
+
+
+if __name__ == '__main__':
+    unittest.main()
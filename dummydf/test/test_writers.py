@@ -0,0 +1,89 @@
+import contextlib
+import io
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from dummydf import DummyDataframe
+from dummydf import writers
+from dummydf.__main__ import main
+from dummydf.test.test_dummydf import YAML_CONFIG_DICT
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestWriters(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT, engine='numpy')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_infer_format_from_extension(self):
+        self.assertEqual('parquet', writers.infer_format('data.parquet'))
+        with self.assertRaises(ValueError):
+            writers.infer_format('data.xlsx')
+
+    def test_csv_written_chunk_by_chunk_equals_whole_dataframe(self):
+        report = self.dummy.write_to(self.path('data.csv'), rows=45, chunk_size=10)
+        self.assertEqual(45, report['rows'])
+        expected_df = pd.concat(self.dummy.iter_chunks(45, 45)).to_csv(index=False)
+        with open(self.path('data.csv'), newline='') as csv_file:
+            self.assertEqual(expected_df, csv_file.read())
+
+    def test_write_faster_than_the_clock_has_no_rows_per_second(self):
+        with mock.patch('dummydf.dummydf.time.perf_counter', return_value=1.0):
+            report = self.dummy.write_to(self.path('data.csv'), rows=5)
+        self.assertEqual(0, report['seconds'])
+        self.assertTrue(math.isnan(report['rows_per_second']))
+
+    def test_python_engine_writes_whole_dataframe(self):
+        dummy = DummyDataframe(yaml_config=YAML_CONFIG_DICT)
+        self.assertEqual(20, dummy.write_to(self.path('data.csv'))['rows'])
+        with self.assertRaises(ValueError):
+            dummy.write_to(self.path('data.csv'), rows=100)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_has_one_row_group_per_chunk(self):
+        import pyarrow.parquet
+        self.dummy.write_to(self.path('data.parquet'), rows=45, chunk_size=10)
+        parquet_file = pyarrow.parquet.ParquetFile(self.path('data.parquet'))
+        self.assertEqual(5, parquet_file.metadata.num_row_groups)
+        self.assertEqual(45, parquet_file.metadata.num_rows)
+        self.assertEqual(pyarrow.binary(), parquet_file.schema_arrow.field('PROFORMA_GUID').type)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_feather_keeps_values_and_nulls(self):
+        self.dummy.write_to(self.path('data.feather'), chunk_size=7)
+        actual_df = pd.read_feather(self.path('data.feather'))
+        expected_df = self.dummy.df
+        self.assertEqual(list(expected_df.columns), list(actual_df.columns))
+        pd.testing.assert_frame_equal(expected_df.isna(), actual_df.isna())
+        self.assertEqual(list(expected_df['EXHAUSTED_REASON'].dropna()), list(actual_df['EXHAUSTED_REASON'].dropna()))
+
+    def test_command_line_writes_file(self):
+        report = main([self.path('data.csv'), '--rows', '30', '--chunk-size', '8', '--seed', '3'])
+        self.assertEqual(30, report['rows'])
+        self.assertEqual(31, len(pd.read_csv(self.path('data.csv'), header=None)))
+
+
+    def test_command_line_reports_options_the_python_engine_cannot_use(self):
+        for options in (['--rows', '100'], ['--workers', '2'], ['--memory-budget', '1000000']):
+            with self.subTest(options=options), contextlib.redirect_stderr(io.StringIO()) as stderr:
+                with self.assertRaises(SystemExit):
+                    main([self.path('data.csv'), '--engine', 'python'] + options)
+                self.assertIn('needs --engine numpy', stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,588 @@
+# Batch generators used by the 'numpy' engine of DummyDataframe.
+# Instead of building every value in a Python loop, each function draws one integer
+# matrix from a numpy Generator and turns it into the whole column at once, e.g. the
+# STRING column is a lookup of a character table with a (rows, length_strings) matrix.
+#
+# The functions mirror the generate_list_with_random_* methods of DummyDataframe and
+# produce columns of the same types, but not the same values: they draw from
+# np.random.Generator instead of the random module.
+#
+# Rows are generated in blocks of BLOCK_ROWS. Every (column, block) pair has its own
+# random stream derived from the root seed, so any range of rows can be generated on its
+# own and gives the same values as the whole column, whatever the size of the range.
+# Every column is one PCG64 stream, keyed once from the root seed, and block b starts
+# b * 2 ** 64 draws into it, far more than a block ever draws, so moving to a block is a
+# cheap advance instead of seeding a new generator.
+# For that to hold, every generator makes exactly one draw from its Generator, so that the
+# first n rows of a block are the same whether n or BLOCK_ROWS rows are drawn.
+
+"""
+Vectorized generators
+"""
+
+import functools
+import string
+import threading
+import zlib
+from typing import Callable, Union
+import numpy as np
+import pandas as pd
+
+# Same characters, in the same order (repetitions included), as the python engine.
+CHARACTERS_TO_CHOOSE_FROM = \
+    string.ascii_lowercase + string.ascii_uppercase + '1234567890' + r'+_#@ñó´,' r'aq´ç+¡|@#~€¬ '
+HEXDIGITS = '0123456789ABCDEF'
+
+# Lookup tables: unicode code points for strings and ASCII codes for hex digits.
+_CHARACTER_TABLE = np.array([ord(character) for character in CHARACTERS_TO_CHOOSE_FROM], dtype=np.uint32)
+_HEXDIGIT_TABLE = np.frombuffer(HEXDIGITS.encode('ascii'), dtype=np.uint8)
+
+# Bounds of the account numbers, same as random.randrange(1, 999999999999) in the python engine.
+ACCOUNT_LOW = 1
+ACCOUNT_HIGH = 999999999999
+
+# Format of the DATETIME strings, same as the python engine.
+DATETIME_FORMAT = '%d.%m.%Y %H:%M:%S'
+# Outputs of the DATETIME column of the numpy engine.
+DATETIME_OUTPUTS = ('string', 'datetime64')
+# strftime directives written by format_datetimes, with their number of digits.
+DATETIME_DIRECTIVES = {'Y': 4, 'y': 2, 'm': 2, 'd': 2, 'j': 3, 'H': 2, 'M': 2, 'S': 2, 'f': 6}
+
+# Number of rows of each block of random streams. Chunks that are multiples of it are
+# generated without any waste.
+BLOCK_ROWS = 2 ** 14
+# Draws between the starts of two consecutive blocks of a stream.
+BLOCK_STRIDE = 2 ** 64
+
+# Generator of each thread, moved to the block to generate by block_generator.
+_LOCAL = threading.local()
+
+
+def stream_key(name: str) -> int:
+    """
+    Stable integer identifying the random stream of a column, independent of PYTHONHASHSEED.
+
+    Args:
+        name (str): name of the stream, e.g. the column type.
+
+    Returns: int
+
+    """
+    return zlib.crc32(name.encode('utf-8'))
+
+
+@functools.lru_cache(maxsize=4096)
+def stream_state(entropy: int, stream: int) -> dict:
+    """
+    State of the PCG64 bit generator at the start of a stream, keyed by the child that
+    SeedSequence(entropy).spawn() would give for the key stream. Cached, so it must not be modified.
+
+    Args:
+        entropy (int): root seed.
+        stream (int): key of the stream, see stream_key.
+
+    Returns: dict
+
+    """
+    return np.random.PCG64(np.random.SeedSequence(entropy, spawn_key=(stream,))).state
+
+
+def block_generator(entropy: int, stream: int, block: int) -> np.random.Generator:
+    """
+    Generator at the start of one block of one stream, BLOCK_STRIDE draws after the start of the
+    previous block. Every thread reuses one Generator, so it is only valid until the next call.
+
+    Args:
+        entropy (int): root seed.
+        stream (int): key of the stream, see stream_key.
+        block (int): index of the block.
+
+    Returns: np.random.Generator
+
+    """
+    if not hasattr(_LOCAL, 'generator'):
+        _LOCAL.generator = np.random.Generator(np.random.PCG64())
+    bit_generator = _LOCAL.generator.bit_generator
+    bit_generator.state = stream_state(entropy, stream)
+    bit_generator.advance(block * BLOCK_STRIDE)
+    return _LOCAL.generator
+
+
+def generate_range(function: Callable, entropy: int, stream: int, start: int, stop: int,
+                   out: np.ndarray = None, **kwargs) -> Union[list, np.ndarray]:
+    """
+    Generate the rows [start, stop) of a stream with one of the generators of this module,
+    block by block.
+
+    Args:
+        function (Callable): generator taking (rng, rows, **kwargs).
+        entropy (int): root seed.
+        stream (int): key of the stream, see stream_key.
+        start (int): first row, included.
+        stop (int): last row, excluded.
+        out (np.ndarray): preallocated array of stop - start rows to fill, e.g. a np.memmap. By default,
+            a new one, or a list if function returns lists.
+        **kwargs: passed to function.
+
+    Returns: Union[list, np.ndarray]
+        same type as the output of function, or out if given.
+
+    """
+    pieces = []
+    for block in range(start // BLOCK_ROWS, -(-stop // BLOCK_ROWS)):
+        block_start = block * BLOCK_ROWS
+        rows = min(stop, block_start + BLOCK_ROWS) - block_start
+        values = function(block_generator(entropy, stream, block), rows, **kwargs)[max(start - block_start, 0):]
+        if out is None and not pieces and isinstance(values, np.ndarray) and len(values) < stop - start:
+            # Copying every block into the output as it is drawn is twice as fast as concatenating them at the end.
+            out = np.empty(stop - start, dtype=values.dtype)
+        if out is None:
+            pieces.append(values)
+        else:
+            offset = max(block_start - start, 0)
+            out[offset:offset + len(values)] = values
+    if out is not None:
+        return out
+    if not pieces:
+        return function(block_generator(entropy, stream, 0), 0, **kwargs)
+    if len(pieces) == 1:
+        return pieces[0]
+    return [value for piece in pieces for value in piece]
+
+
+def split_range(start: int, stop: int, parts: int) -> list:
+    """
+    Split the rows [start, stop) into at most parts consecutive ranges of similar size, cut at
+    block boundaries so that no block has to be generated twice.
+
+    Args:
+        start (int): first row, included.
+        stop (int): last row, excluded.
+        parts (int): maximum number of ranges.
+
+    Returns: list
+        of (start, stop) tuples.
+
+    """
+    first_block, last_block = start // BLOCK_ROWS, -(-stop // BLOCK_ROWS)
+    boundaries = np.linspace(first_block, last_block, min(parts, last_block - first_block) + 1).round()
+    cuts = [start] + [int(block) * BLOCK_ROWS for block in boundaries[1:-1]] + [stop]
+    return [(low, high) for low, high in zip(cuts[:-1], cuts[1:]) if low < high]
+
+
+def random_strings(rng: np.random.Generator, rows: int, length: int) -> np.ndarray:
+    """
+    Index the character table with one (rows, length) integer matrix.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        length (int): number of characters of each string.
+
+    Returns: np.ndarray
+        of dtype '<U{length}'.
+
+    """
+    if length == 0:
+        # numpy has no zero width strings to view the matrix as.
+        return np.full(rows, '', dtype='<U1')
+    indexes = rng.integers(0, len(_CHARACTER_TABLE), size=(rows, length), dtype=np.intp)
+    # Every row of code points is reinterpreted as one fixed width unicode string.
+    return _CHARACTER_TABLE[indexes].view('<U{}'.format(length)).ravel()
+
+
+def random_bytes(rng: np.random.Generator, rows: int, length: int) -> list:
+    """
+    Draw all the bytes at once and cut them into one bytearray per row.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        length (int): number of bytes of each value.
+
+    Returns: list
+        of bytearray.
+
+    """
+    if length == 0:
+        return [bytearray() for _ in range(rows)]
+    buffer = rng.integers(0, 256, size=rows * length, dtype=np.uint8).tobytes()
+    return [bytearray(buffer[start:start + length]) for start in range(0, rows * length, length)]
+
+
+def random_fixed_bytes(rng: np.random.Generator, rows: int, length: int) -> np.ndarray:
+    """
+    Same values as random_bytes, but in one contiguous buffer of fixed width items instead of
+    one bytearray object per row. Note that numpy strips the trailing null bytes of an item when
+    it is read on its own, the buffer itself is untouched.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        length (int): number of bytes of each value.
+
+    Returns: np.ndarray
+        of dtype 'S{length}'.
+
+    """
+    return rng.integers(0, 256, size=rows * length, dtype=np.uint8).view('S{}'.format(length))
+
+
+def fixed_bytes_to_pandas(values: np.ndarray) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """
+    Expose a fixed width bytes buffer to pandas without copying it, as an Arrow fixed size binary
+    array. This needs pyarrow and pandas >= 1.5, otherwise the numpy array is returned as it is
+    and pandas stores it as an object column.
+
+    Args:
+        values (np.ndarray): of dtype 'S{length}', e.g. from random_fixed_bytes.
+
+    Returns: Union[np.ndarray, pd.api.extensions.ExtensionArray]
+
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return values
+    if not hasattr(pd.arrays, 'ArrowExtensionArray'):
+        return values
+    values = np.ascontiguousarray(values)
+    array = pa.FixedSizeBinaryArray.from_buffers(
+        pa.binary(values.dtype.itemsize), len(values), [None, pa.py_buffer(values)])
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def random_hexadecimal_digits(rng: np.random.Generator, rows: int, length: int) -> np.ndarray:
+    """
+    Index the hex digits table with one (rows, length) integer matrix.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        length (int): number of digits of each value.
+
+    Returns: np.ndarray
+        of dtype '<U{length}'.
+
+    """
+    if length == 0:
+        return np.full(rows, '', dtype='<U1')
+    indexes = rng.integers(0, len(_HEXDIGIT_TABLE), size=(rows, length), dtype=np.uint8)
+    return _HEXDIGIT_TABLE[indexes].view('S{}'.format(length)).ravel().astype('<U{}'.format(length))
+
+
+def random_accounts(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+
+    Returns: np.ndarray
+        of int64 account numbers.
+
+    """
+    return rng.integers(ACCOUNT_LOW, ACCOUNT_HIGH, size=rows, dtype=np.int64)
+
+
+def feistel_permutation(values: np.ndarray, bits: int, keys: np.ndarray) -> np.ndarray:
+    """
+    Keyed pseudorandom permutation of [0, 2 ** bits): a balanced Feistel network with one round
+    per key, whose round function mixes the right half with the splitmix64 finalizer. Any Feistel
+    network is a bijection, so distinct values always give distinct outputs.
+
+    Args:
+        values (np.ndarray): uint64 values below 2 ** bits.
+        bits (int): even number of bits of the domain, at most 64.
+        keys (np.ndarray): uint64 round keys.
+
+    Returns: np.ndarray
+        of uint64.
+
+    """
+    half = np.uint64(bits // 2)
+    mask = np.uint64((1 << (bits // 2)) - 1)
+    left, right = values >> half, values & mask
+    for key in keys:
+        mixed = right ^ key
+        mixed = (mixed ^ (mixed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        mixed = (mixed ^ (mixed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        mixed ^= mixed >> np.uint64(31)
+        left, right = right, left ^ (mixed & mask)
+    return (left << half) | right
+
+
+def unique_permutation(keys: np.ndarray, start: int, stop: int, size: int) -> np.ndarray:
+    """
+    Values of the rows [start, stop) of a keyed permutation of [0, size): row i gets the permutation
+    of i, so rows are distinct across any chunks or shards and no value is stored. The Feistel network
+    works on the smallest even number of bits covering size, and outputs outside [0, size) are
+    permuted again until they fall inside (cycle walking), which keeps it a bijection.
+
+    Args:
+        keys (np.ndarray): uint64 round keys.
+        start (int): first row, included.
+        stop (int): last row, excluded.
+        size (int): number of possible values, at most 2 ** 64.
+
+    Returns: np.ndarray
+        of uint64.
+
+    """
+    if stop > size:
+        raise ValueError('Only {} unique values are possible, cannot generate row {}'.format(size, stop - 1))
+    bits = max(2, (size - 1).bit_length() + (size - 1).bit_length() % 2)
+    values = feistel_permutation(np.arange(start, stop, dtype=np.uint64), bits, keys)
+    if size == 2 ** bits:
+        return values
+    outside = values >= np.uint64(size)
+    while outside.any():
+        values[outside] = feistel_permutation(values[outside], bits, keys)
+        outside = values >= np.uint64(size)
+    return values
+
+
+def unique_accounts(keys: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """
+    Args:
+        keys (np.ndarray): uint64 round keys.
+        start (int): first row, included.
+        stop (int): last row, excluded.
+
+    Returns: np.ndarray
+        of distinct int64 account numbers in [ACCOUNT_LOW, ACCOUNT_HIGH).
+
+    """
+    return unique_permutation(keys, start, stop, ACCOUNT_HIGH - ACCOUNT_LOW).astype(np.int64) + ACCOUNT_LOW
+
+
+def unique_hexadecimal_digits(keys: np.ndarray, start: int, stop: int, length: int) -> np.ndarray:
+    """
+    Args:
+        keys (np.ndarray): uint64 round keys.
+        start (int): first row, included.
+        stop (int): last row, excluded.
+        length (int): number of digits of each value, at most 16.
+
+    Returns: np.ndarray
+        of distinct values of dtype '<U{length}'.
+
+    """
+    if length > 16:
+        raise ValueError('Unique hexadecimal values have 16 digits at most, got {}'.format(length))
+    values = unique_permutation(keys, start, stop, 16 ** length)
+    shifts = np.arange(4 * (length - 1), -1, -4, dtype=np.uint64)
+    digits = ((values[:, np.newaxis] >> shifts) & np.uint64(0xF)).astype(np.intp)
+    return _HEXDIGIT_TABLE[digits].view('S{}'.format(length)).ravel().astype('<U{}'.format(length))
+
+
+def random_floats(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+
+    Returns: np.ndarray
+        of float64 drawn from a standard normal distribution.
+
+    """
+    return rng.standard_normal(rows)
+
+
+def random_uniform(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+
+    Returns: np.ndarray
+        of float64 drawn uniformly in [0, 1).
+
+    """
+    return rng.random(rows)
+
+
+def random_integers(rng: np.random.Generator, rows: int, max_integer: int) -> np.ndarray:
+    """
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        max_integer (int): exclusive upper bound.
+
+    Returns: np.ndarray
+        of int64.
+
+    """
+    return rng.integers(0, max_integer, size=rows, dtype=np.int64)
+
+
+def parse_datetime_format(datetime_format: str) -> Union[list, None]:
+    """
+    Split a strftime format into literal strings and the directives that format_datetimes
+    writes itself (see DATETIME_DIRECTIVES).
+
+    Args:
+        datetime_format (str): strftime format, e.g. '%d.%m.%Y %H:%M:%S'.
+
+    Returns: Union[list, None]
+        of literal strings and directive letters, in order, or None if the format has other directives.
+
+    """
+    tokens, literal, position = [], '', 0
+    while position < len(datetime_format):
+        character = datetime_format[position]
+        if character != '%':
+            literal += character
+            position += 1
+            continue
+        directive = datetime_format[position + 1:position + 2]
+        if directive == '%':
+            literal += '%'
+        elif directive in DATETIME_DIRECTIVES:
+            tokens += [literal, directive] if literal else [directive]
+            literal = ''
+        else:
+            return None
+        position += 2
+    return tokens + [literal] if literal else tokens
+
+
+def datetime_format_width(datetime_format: str) -> Union[int, None]:
+    """
+    Args:
+        datetime_format (str): strftime format.
+
+    Returns: Union[int, None]
+        characters of every formatted value, or None if format_datetimes falls back to pandas.
+
+    """
+    tokens = parse_datetime_format(datetime_format)
+    if tokens is None:
+        return None
+    return sum(DATETIME_DIRECTIVES[token] if token in DATETIME_DIRECTIVES else len(token) for token in tokens)
+
+
+def format_datetimes(values: np.ndarray, datetime_format: str) -> np.ndarray:
+    """
+    Bulk strftime: every field of the format is computed for the whole array with integer
+    arithmetic and written as digits into one (rows, width) matrix of code points, which is then
+    reinterpreted as fixed width strings. Formats with directives other than DATETIME_DIRECTIVES,
+    or years outside [1000, 9999], fall back to the strftime of pandas.
+
+    Args:
+        values (np.ndarray): of dtype datetime64.
+        datetime_format (str): strftime format.
+
+    Returns: np.ndarray
+        of dtype '<U{width}', or of str objects with the fallback.
+
+    """
+    tokens = parse_datetime_format(datetime_format)
+    years = values.astype('M8[Y]').astype(np.int64) + 1970
+    if tokens is None or (len(values) and (years.min() < 1000 or years.max() > 9999)):
+        return pd.DatetimeIndex(values).strftime(datetime_format).values.astype(object)
+    days = values.astype('M8[D]')
+    seconds_of_day = (values.astype('M8[s]') - days).astype(np.int64)
+    fields = {
+        'Y': lambda: years,
+        'y': lambda: years % 100,
+        'm': lambda: values.astype('M8[M]').astype(np.int64) % 12 + 1,
+        'd': lambda: (days - values.astype('M8[M]')).astype(np.int64) + 1,
+        'j': lambda: (days - values.astype('M8[Y]')).astype(np.int64) + 1,
+        'H': lambda: seconds_of_day // 3600,
+        'M': lambda: seconds_of_day // 60 % 60,
+        'S': lambda: seconds_of_day % 60,
+        'f': lambda: (values.astype('M8[us]') - values.astype('M8[s]')).astype(np.int64),
+    }
+    width = datetime_format_width(datetime_format)
+    if width == 0:
+        return np.full(len(values), '', dtype='<U1')
+    characters = np.empty((len(values), width), dtype=np.uint32)
+    column = 0
+    for token in tokens:
+        if token in DATETIME_DIRECTIVES:
+            field, digits = fields[token](), DATETIME_DIRECTIVES[token]
+            for digit in range(digits):
+                characters[:, column + digit] = field // 10 ** (digits - 1 - digit) % 10 + ord('0')
+            column += digits
+        else:
+            characters[:, column:column + len(token)] = [ord(character) for character in token]
+            column += len(token)
+    return characters.view('<U{}'.format(width)).ravel()
+
+
+def random_datetimes(rng: np.random.Generator, rows: int, datetime_start, datetime_end,
+                     datetime_format: str = DATETIME_FORMAT, output: str = 'string') -> np.ndarray:
+    """
+    Draw the timestamps uniformly at second resolution over [datetime_start, datetime_end], with one
+    integer draw for all the rows.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of values to generate.
+        datetime_start: first timestamp of the range.
+        datetime_end: last timestamp of the range, included.
+        datetime_format (str): format of the output strings, see format_datetimes.
+        output (str): one of DATETIME_OUTPUTS, 'string' (default) for formatted strings or
+            'datetime64' for native datetime64[ns] values.
+
+    Returns: np.ndarray
+        of dtype datetime64[ns] or strings.
+
+    """
+    if output not in DATETIME_OUTPUTS:
+        raise ValueError('datetime_output must be one of {}, got {!r}'.format(DATETIME_OUTPUTS, output))
+    start = np.datetime64(pd.Timestamp(datetime_start), 's')
+    span = int((np.datetime64(pd.Timestamp(datetime_end), 's') - start).astype(np.int64))
+    values = start + rng.integers(0, span + 1, size=rows).astype('m8[s]')
+    if output == 'datetime64':
+        return values.astype('M8[ns]')
+    return format_datetimes(values, datetime_format)
+
+
+def rubbish_code_dtype(rubbish_values: int) -> np.dtype:
+    """
+    Args:
+        rubbish_values (int): number of rubbish values.
+
+    Returns: np.dtype
+        smallest signed integer dtype holding every code, -1 and the number of rubbish values, int8 up to
+        127 rubbish values.
+
+    """
+    return np.min_scalar_type(-rubbish_values - 1)
+
+
+def rubbish_codes(uniform: np.ndarray, probabilities: np.ndarray) -> np.ndarray:
+    """
+    Categorical draw from uniform draws in [0, 1): the index of the rubbish value to insert in
+    each cell, or -1 to keep the original value. Each rubbish value k is drawn with probability
+    probabilities[k].
+
+    Args:
+        uniform (np.ndarray): one uniform draw per cell, of any shape.
+        probabilities (np.ndarray): probability of each rubbish value, summing up to 1 at most.
+
+    Returns: np.ndarray
+        of codes of dtype rubbish_code_dtype, with the shape of uniform.
+
+    """
+    codes = np.searchsorted(np.cumsum(probabilities), uniform, side='right').astype(
+        rubbish_code_dtype(len(probabilities)))
+    codes[codes == len(probabilities)] = -1
+    return codes
+
+
+def random_rubbish_codes(rng: np.random.Generator, rows: int, probabilities: np.ndarray) -> np.ndarray:
+    """
+    One categorical draw per cell, see rubbish_codes.
+
+    Args:
+        rng (np.random.Generator): source of randomness.
+        rows (int): number of cells to draw.
+        probabilities (np.ndarray): probability of each rubbish value, summing up to 1 at most.
+
+    Returns: np.ndarray
+        of codes of dtype rubbish_code_dtype.
+
+    """
+    return rubbish_codes(rng.random(rows), probabilities)
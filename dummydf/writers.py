@@ -0,0 +1,143 @@
+# Writers that stream the chunks of a DummyDataframe straight to disk, so that files bigger
+# than memory can be generated. Used by DummyDataframe.write_to and by the command line:
+#
+# python -m dummydf output.parquet --rows 100000000 --chunk-size 1000000
+#
+# CSV only needs pandas. Parquet and Feather need pyarrow, which is imported only when
+# those formats are written (pip install pyarrow).
+
+"""
+Writers
+"""
+
+import os
+from typing import Iterable
+import numpy as np
+import pandas as pd
+
+FORMATS = ('csv', 'parquet', 'feather')
+# Extensions recognised when the format is not given.
+EXTENSIONS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet', '.feather': 'feather', '.arrow': 'feather'}
+
+
+def import_pyarrow():
+    """
+    Import pyarrow, with a helpful message if it is missing.
+
+    Returns: module
+        pyarrow, with pyarrow.compute imported, which import pyarrow alone does not.
+
+    """
+    try:
+        import pyarrow
+        import pyarrow.compute
+    except ImportError as error:
+        raise ImportError('Parquet, Feather and the arrow backend need pyarrow: pip install pyarrow') from error
+    return pyarrow
+
+
+def infer_format(path: str) -> str:
+    """
+    Args:
+        path (str): output file, whose extension gives the format.
+
+    Returns: str
+        one of FORMATS.
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXTENSIONS:
+        raise ValueError('Cannot infer the format of {!r}, pass one of {}'.format(path, FORMATS))
+    return EXTENSIONS[extension]
+
+
+def object_column_to_arrow(values: np.ndarray, binary: bool):
+    """
+    Arrow columns are typed, so the rubbish strings mixed with other values in object columns
+    are written as text: binary columns (BYTE) get them utf-8 encoded, and any other object
+    column is written as strings. NaN and None become nulls.
+
+    Args:
+        values (np.ndarray): object values.
+        binary (bool): write a binary column instead of a string one.
+
+    Returns: pa.Array
+
+    """
+    pa = import_pyarrow()
+    mask = pd.isna(values)
+    if binary:
+        return pa.array([None if missing else value.encode('utf-8') if isinstance(value, str) else bytes(value)
+                         for value, missing in zip(values, mask)], type=pa.binary())
+    return pa.array(values.astype(str), mask=mask, type=pa.string())
+
+
+def dataframe_to_arrow(df: pd.DataFrame, binary_columns: Iterable[str] = ()):
+    """
+    Convert a chunk to an Arrow table. Native and nullable pandas dtypes are converted as they are,
+    object columns with object_column_to_arrow.
+
+    Args:
+        df (pd.DataFrame): chunk to convert.
+        binary_columns (Iterable[str]): object columns to write as binary.
+
+    Returns: pa.Table
+
+    """
+    pa = import_pyarrow()
+    binary_columns = set(binary_columns)
+    arrays = [
+        object_column_to_arrow(df[column].to_numpy(), column in binary_columns) if df[column].dtype == object
+        else pa.Array.from_pandas(df[column])
+        for column in df.columns
+    ]
+    return pa.Table.from_arrays(arrays, names=[str(column) for column in df.columns])
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], path: str, file_format: str = None,
+                 binary_columns: Iterable[str] = ()) -> int:
+    """
+    Write the chunks, pandas dataframes or Arrow tables, one after the other, keeping only one of them
+    in memory at a time:
+        - csv: appended to the same file, with the header of the first chunk.
+        - parquet: one row group per chunk.
+        - feather: one record batch per chunk of an Arrow IPC file (Feather V2).
+
+    Args:
+        chunks (Iterable): pd.DataFrame or pa.Table chunks of the dataframe, all with the same columns.
+        path (str): output file.
+        file_format (str): one of FORMATS. By default, inferred from the extension of path.
+        binary_columns (Iterable[str]): parquet and feather only, object columns to write as binary.
+
+    Returns: int
+        number of rows written.
+
+    """
+    file_format = file_format or infer_format(path)
+    if file_format not in FORMATS:
+        raise ValueError('file_format must be one of {}, got {!r}'.format(FORMATS, file_format))
+    rows = 0
+    if file_format == 'csv':
+        with open(path, 'w', newline='') as csv_file:
+            for chunk in chunks:
+                if not isinstance(chunk, pd.DataFrame):
+                    chunk = chunk.to_pandas()
+                chunk.to_csv(csv_file, header=rows == 0, index=False)
+                rows += len(chunk)
+        return rows
+
+    pa = import_pyarrow()
+    import pyarrow.parquet
+    writer = None
+    try:
+        for chunk in chunks:
+            table = dataframe_to_arrow(chunk, binary_columns) if isinstance(chunk, pd.DataFrame) else chunk
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema) if file_format == 'parquet' \
+                    else pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
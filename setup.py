@@ -29,5 +29,8 @@ setup(
         'pandas==1.3.5',
         'PyYAML==6.0'
     ],
+    extras_require={
+        'arrow': ['pyarrow']
+    },
     include_package_data=True,
 )